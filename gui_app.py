@@ -5,16 +5,19 @@ from threading import Thread
 from functools import partial
 from indeed_job_scraper import IndeedJobScraper 
 from indeed_job_database import IndeedJobDatabaseManager
+from indeed_job_runner import BackgroundJobRunner
+from indeed_browser_pool import BrowserSessionPool
 import subprocess
 
 import json
 import os
+import queue
 
 class IndeedJobScraperGUI:
     def __init__(self, master):
         self.master = master
         self.master.title("Indeed Job Scraper")
-        self.master.geometry("600x400")
+        self.master.geometry("600x450")
 
         self.default_config = self.load_config("config.json")
         self.title_label = ttk.Label(self.master, text="Job Title:")
@@ -70,30 +73,44 @@ class IndeedJobScraperGUI:
         self.run_button.grid(row=9, column=0, padx=10, pady=10, sticky="we")
         self.export_button.grid(row=9, column=1, padx=10, pady=10, sticky="we")
 
+        self.cancel_button = ttk.Button(self.master, text="Cancel", command=self.cancel_scrape)
+        self.status_label = ttk.Label(self.master, text="Idle", foreground="gray")
+        self.cancel_button.grid(row=10, column=0, padx=10, pady=10, sticky="we")
+        self.status_label.grid(row=10, column=1, padx=10, pady=10, sticky="w")
+
+        # Scrapes and exports run off the Tk thread, results come back through poll_events
+        self.scrape_runner = BackgroundJobRunner()
+        self.export_runner = BackgroundJobRunner()
+        self.master.after(200, self.poll_events)
+
+        # Keep a warm browser between searches instead of cold-starting Chrome per click
+        self.browser_pool = BrowserSessionPool(max_size=1)
+        self.database_manager = None
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
+
 
     def export_database(self):
             title = self.title_entry.get()
             location = self.location_entry.get()
 
-            try:
-                # Instantiate the IndeedJobDatabaseManager
-                database_manager = IndeedJobDatabaseManager()
+            self.export_runner.submit(f"Export {title} in {location}", self.export_task, location, title)
 
-                # Execute export command
-                database_manager.export_data(location, title)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export database: {e}")
+    def get_database_manager(self):
+            # One manager for the lifetime of the window, only used from the export runner's thread
+            if self.database_manager is None:
+                self.database_manager = IndeedJobDatabaseManager()
+            return self.database_manager
+
+    def export_task(self, location, title, progress=None, cancel_event=None):
+            # Execute export command
+            return self.get_database_manager().export_data(location, title)
 
     def clear_database(self):
-            try:
-                # Instantiate the IndeedJobDatabaseManager
-                database_manager = IndeedJobDatabaseManager()
+            self.export_runner.submit("Clear database", self.clear_task)
 
-                # Clear the database
-                database_manager.delete_data("","")
-                messagebox.showinfo("Success", "Database cleared successfully.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to clear database: {e}")
+    def clear_task(self, progress=None, cancel_event=None):
+            # Clear the database
+            self.get_database_manager().delete_data("", "", delete_all=True)
 
     def run_script(self):
         title = self.title_entry.get()
@@ -105,8 +122,62 @@ class IndeedJobScraperGUI:
         
         self.update_config_callback()
 
-        scraper = IndeedJobScraper()
-        scraper.scrape_jobs(title, location, int(pages), job_type, locale, switched_by)
+        self.scrape_runner.submit(f"{title} in {location or locale}", self.scrape_task,
+                                  title, location, int(pages), job_type, locale, switched_by)
+
+    def scrape_task(self, title, location, pages, job_type, locale, switched_by, progress=None, cancel_event=None):
+        scraper = IndeedJobScraper(browser_pool=self.browser_pool)
+        try:
+            # Only the count is shown, so records are streamed instead of kept
+            jobs = scraper.iter_jobs(title, location, pages, job_type, locale, switched_by,
+                                     progress_callback=progress, cancel_event=cancel_event)
+            found = sum(1 for _ in jobs)
+            # iter_jobs prints its errors instead of raising them, report them as a failed task
+            if not scraper.completed and not cancel_event.is_set():
+                raise RuntimeError(f"Scrape stopped after {found} jobs, see the console for the error")
+            return found
+        finally:
+            # Hands the browser and the DB connection back to their pools
+            scraper.close()
+
+    def on_close(self):
+        self.scrape_runner.cancel_all()
+        self.browser_pool.close()
+        if self.database_manager is not None:
+            self.database_manager.close()
+        self.master.destroy()
+
+    def cancel_scrape(self):
+        self.scrape_runner.cancel_all()
+        self.status_label.config(text="Cancelling...")
+
+    def poll_events(self):
+        for runner in (self.scrape_runner, self.export_runner):
+            while True:
+                try:
+                    kind, label, info = runner.events.get_nowait()
+                except queue.Empty:
+                    break
+                self.show_event(runner, kind, label, info)
+        self.master.after(200, self.poll_events)
+
+    def show_event(self, runner, kind, label, info):
+        waiting = f" ({runner.queued()} queued)" if runner.queued() else ""
+        if kind == "queued":
+            text = f"Queued: {label}{waiting}"
+        elif kind == "started":
+            text = f"Running: {label}{waiting}"
+        elif kind == "progress":
+            text = (f"{label}: page {info['page']}, {info['cards']} cards, "
+                    f"{info['saved']} saved, {info['elapsed']:.0f}s{waiting}")
+        elif kind == "done":
+            text = f"Finished: {label}{waiting}"
+        elif kind == "cancelled":
+            text = f"Cancelled: {label}{waiting}"
+        else:
+            text = f"Failed: {label}{waiting}"
+            messagebox.showerror("Error", f"{label} failed: {info}")
+        self.status_label.config(text=text)
 
 
     def load_config(self, file_path):
@@ -0,0 +1,258 @@
+import argparse
+import html
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlsplit
+
+from prettytable import PrettyTable
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from indeed_dates import PostDateParser
+from indeed_job_database import IndeedJobDatabaseManager
+from indeed_job_scraper import BULK_EXTRACT_SCRIPT, IndeedJobScraper, convert_date
+from indeed_page_readiness import READINESS_SCRIPT, PageReadinessWaiter
+from indeed_rate_control import RateController
+from indeed_storage import SQLiteStorage
+
+DATE_PHRASES = ["Vandaag", "Zojuist geplaatst", "1 dag geleden", "3 dagen geleden", "30+ dagen geleden"]
+CARD_FIELDS = ["title", "company", "link", "location", "date"]
+
+def load_fixture_cards(path, pages, cards_per_page, missing_rate=0.0, seed=1):
+    # Recorded jobs recycled into pages of cards, with unique jk ids so every card is new
+    with open(path, "r", encoding="utf-8") as json_file:
+        recorded = json.load(json_file)
+    rng = random.Random(seed)
+    result_pages = []
+    for page in range(pages):
+        cards = []
+        for index in range(cards_per_page):
+            job_data = recorded[(page * cards_per_page + index) % len(recorded)]
+            card = {
+                "title": job_data["Title"],
+                "company": job_data["Company"],
+                "link": f"https://nl.indeed.com/rc/clk?jk={page:06x}{index:010x}",
+                "location": job_data["Location"],
+                "date": rng.choice(DATE_PHRASES),
+            }
+            for field in CARD_FIELDS:
+                if rng.random() < missing_rate:
+                    card[field] = None
+            cards.append(card)
+        result_pages.append(cards)
+    return result_pages
+
+def render_page(cards):
+    # Same structure the HTML parser and the bulk script read
+    parts = ["<html><body><div id='mosaic-jobResults'>"]
+    for card in cards:
+        parts.append("<div class='job_seen_beacon'><h2 class='jobTitle'>")
+        if card["title"] is not None:
+            title = f"<span>{html.escape(card['title'])}</span>"
+            parts.append(f"<a href='{html.escape(card['link'])}'>{title}</a>" if card["link"] else title)
+        parts.append("</h2>")
+        for test_id, field in (("company-name", "company"), ("text-location", "location"), ("myJobsStateDate", "date")):
+            if card[field] is not None:
+                parts.append(f"<div data-testid='{test_id}'>{html.escape(card[field])}</div>")
+        parts.append("</div>")
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+class FakeElement:
+    def __init__(self, card, field=None, parent=None):
+        self.card = card
+        self.field = field
+        self.parent = parent
+
+    @property
+    def text(self):
+        return self.card[self.field] or ""
+
+    def get_attribute(self, name):
+        return self.card["link"] if name == "href" and self.field == "link" else None
+
+    def find_element(self, by=By.ID, value=None):
+        field = {
+            "h2.jobTitle span": "title",
+            '[data-testid="company-name"]': "company",
+            '[data-testid="text-location"]': "location",
+            '[data-testid="myJobsStateDate"]': "date",
+        }.get(value)
+        if by == By.XPATH and value == "./parent::a" and self.field == "title" and self.card["link"]:
+            field = "link"
+        if field is None or self.card[field] is None:
+            raise NoSuchElementException(f"{by}={value}")
+        return FakeElement(self.card, field, self)
+
+    def find_elements(self, by=By.ID, value=None):
+        try:
+            return [self.find_element(by, value)]
+        except NoSuchElementException:
+            return []
+
+class FakeDriver:
+    # Replays recorded result pages; get() picks the page from the start= offset
+    def __init__(self, pages, latency=0.0, cards_per_page=15):
+        self.pages = pages
+        self.latency = latency
+        self.cards_per_page = cards_per_page
+        self.cards = []
+        self.gets = 0
+
+    def get(self, url):
+        self.gets += 1
+        if self.latency:
+            time.sleep(self.latency)
+        start = int(parse_qs(urlsplit(url).query).get("start", ["0"])[0])
+        page = start // 10
+        self.cards = self.pages[page] if page < len(self.pages) else []
+
+    def execute_script(self, script, *args):
+        if script == READINESS_SCRIPT:
+            return ["complete", len(self.cards), 1]
+        if script == BULK_EXTRACT_SCRIPT:
+            return [dict(card, link=card["link"] if card["title"] is not None else None) for card in self.cards]
+        return 1
+
+    def find_elements(self, by=By.ID, value=None):
+        if value == "div.job_seen_beacon":
+            return [FakeElement(card) for card in self.cards]
+        return []
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    @property
+    def page_source(self):
+        return render_page(self.cards)
+
+    def quit(self):
+        pass
+
+class FakeBrowserPool:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def acquire(self):
+        return self.driver
+
+    def release(self, driver, pages=0):
+        pass
+
+    def close(self):
+        pass
+
+@contextmanager
+def working_directory(path):
+    # The scraper keeps its index, watermark and checkpoint files in the current directory
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+@contextmanager
+def measure(results, name, unit_counts):
+    # unit_counts is filled in by the benchmark body, e.g. {"pages": 10, "cards": 150}
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rates = ", ".join(f"{count / elapsed:,.1f} {unit}/s" for unit, count in unit_counts.items())
+        results.append((name, f"{elapsed:.3f}", rates, f"{peak / (1024 * 1024):.2f}"))
+
+def run_benchmarks(args):
+    pages = load_fixture_cards(args.fixtures, args.pages, args.cards, args.missing_rate, args.seed)
+    driver = FakeDriver(pages, args.latency, args.cards)
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+        storage = SQLiteStorage(os.path.join(workdir, "bench.db"))
+        scraper = IndeedJobScraper(browser_pool=FakeBrowserPool(driver), storage=storage)
+        # Polling is what we measure, not sleeping between polls
+        scraper.readiness = PageReadinessWaiter(poll_interval=args.poll_interval)
+        # No pacing against the fake driver, --latency stands in for Indeed
+        scraper.rate_controller = RateController(initial_rate=1e6, max_rate=1e6)
+
+        counts = {}
+        with measure(results, f"scrape_jobs ({args.extraction})", counts):
+            jobs = sum(1 for _ in scraper.iter_jobs("developer", "Amsterdam", args.pages, "Fulltime", "nl",
+                                                    extraction=args.extraction))
+            counts.update(pages=driver.gets, cards=sum(len(cards) for cards in pages[:driver.gets]),
+                          rows=scraper.writer.total_inserted)
+        print(f"scrape_jobs returned {jobs} jobs")
+
+        cards = [FakeElement(card) for card in pages[0]]
+        scraper.locale = "nl"
+        scraper.processed_job_keys.clear()
+        scraper.seen_index = type(scraper.seen_index)(os.path.join(workdir, "empty.idx"))
+        counts = {}
+        with measure(results, "extract_job_details", counts):
+            for _ in range(args.repeat):
+                for card in cards:
+                    scraper.extract_job_details(card)
+            counts.update(cards=args.repeat * len(cards))
+
+        phrases = [card["date"] for cards in pages for card in cards if card["date"]]
+        counts = {}
+        with measure(results, "convert_date", counts):
+            for _ in range(args.repeat):
+                for phrase in phrases:
+                    convert_date(phrase, "nl")
+            counts.update(calls=args.repeat * len(phrases))
+
+        date_parser = PostDateParser()
+        counts = {}
+        with measure(results, "PostDateParser.parse", counts):
+            for _ in range(args.repeat):
+                for phrase in phrases:
+                    date_parser.parse(phrase, "nl")
+            counts.update(calls=args.repeat * len(phrases))
+
+        manager = IndeedJobDatabaseManager(storage)
+        rows = storage.fetch_all("SELECT COUNT(*) FROM indeed_jobs")[0][0]
+        for output_format in ("csv", "jsonl"):
+            counts = {}
+            with measure(results, f"export_data ({output_format})", counts):
+                manager.export_data(None, None, output_format=output_format)
+                counts.update(rows=rows)
+
+        scraper.close()
+
+    table = PrettyTable()
+    table.field_names = ["Benchmark", "Seconds", "Throughput", "Peak MB"]
+    table.align = "l"
+    for row in results:
+        table.add_row(row)
+    print(table)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks with recorded pages, a fake WebDriver and SQLite")
+    parser.add_argument("--fixtures", default="job_data.json", help="Recorded jobs used to build result pages")
+    parser.add_argument("--pages", type=int, default=20, help="Result pages to replay")
+    parser.add_argument("--cards", type=int, default=15, help="Cards per page, fewer than 15 ends a scrape after one page")
+    parser.add_argument("--extraction", choices=["script", "html"], default="script", help="How cards are read from the fake browser")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every page load")
+    parser.add_argument("--missing-rate", type=float, default=0.0,
+                        help="Chance each card field is missing, missing titles hit the per-field WebDriverWait fallback")
+    parser.add_argument("--poll-interval", type=float, default=0.0, help="Readiness poll interval used by the scraper")
+    parser.add_argument("--repeat", type=int, default=200, help="Rounds for the per-call benchmarks")
+    parser.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args()
+    args.fixtures = os.path.abspath(args.fixtures)
+    run_benchmarks(args)
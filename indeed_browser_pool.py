@@ -0,0 +1,136 @@
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Job cards only need the DOM, skip everything that is just page weight
+BLOCKED_URL_PATTERNS = [
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+]
+
+def create_chrome_driver(light=True):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=3,2")
+
+    if light:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
+
+    driver = webdriver.Chrome(options=options)
+
+    try:
+        # Needed for the pool's heap check
+        driver.execute_cdp_cmd("Performance.enable", {})
+        if light:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Error: {e}")
+
+    return driver
+
+class BrowserSession:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.monotonic()
+
+class BrowserSessionPool:
+    def __init__(self, max_size=2, max_pages=50, max_heap_mb=512, light=True):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.light = light
+        self.condition = threading.Condition()
+        self.idle = []
+        self.sessions = {}
+        self.closed = False
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                while self.idle:
+                    session = self.idle.pop()
+                    if self.healthy(session):
+                        return session.driver
+                    self.discard(session)
+
+                if len(self.sessions) < self.max_size:
+                    # Reserve the slot, the browser itself starts outside the lock
+                    placeholder = object()
+                    self.sessions[id(placeholder)] = placeholder
+                    break
+                self.condition.wait()
+
+        try:
+            driver = create_chrome_driver(self.light)
+        except Exception:
+            with self.condition:
+                del self.sessions[id(placeholder)]
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            del self.sessions[id(placeholder)]
+            self.sessions[id(driver)] = BrowserSession(driver)
+        return driver
+
+    def release(self, driver, pages=0):
+        with self.condition:
+            session = self.sessions.get(id(driver))
+            if session is None:
+                return
+            session.pages += pages
+
+            if self.closed or session.pages >= self.max_pages:
+                # Recycle long-lived browsers before they bloat
+                self.discard(session)
+            else:
+                self.idle.append(session)
+            self.condition.notify()
+
+    def heap_mb(self, driver):
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        for metric in metrics.get("metrics", []):
+            if metric["name"] == "JSHeapTotalSize":
+                return metric["value"] / (1024 * 1024)
+        return 0
+
+    def healthy(self, session):
+        try:
+            if session.driver.execute_script("return 1") != 1:
+                return False
+        except Exception:
+            return False
+
+        try:
+            heap = self.heap_mb(session.driver)
+        except Exception:
+            heap = 0
+        if heap > self.max_heap_mb:
+            print(f"Recycling browser using {heap:.0f} MB of JS heap.")
+            return False
+        return True
+
+    def discard(self, session):
+        # Caller holds the lock
+        self.sessions.pop(id(session.driver), None)
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Error: {e}")
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            for session in idle:
+                self.discard(session)
+            self.condition.notify_all()
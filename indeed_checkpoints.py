@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Scrapers in one process share the file, each update re-reads it under this lock
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+def file_lock(path):
+    with _file_locks_lock:
+        return _file_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+class CrawlCheckpointStore:
+    # Progress of unfinished crawls, per query. An entry is removed once its crawl completes.
+    def __init__(self, path="crawl_checkpoints.json", max_age_hours=6):
+        self.path = path
+        # Results are sorted by date, after a while the saved offset points at different postings
+        self.max_age_hours = max_age_hours
+        self.lock = file_lock(path)
+        self.checkpoints = self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def get(self, key):
+        return self.checkpoints.get(key)
+
+    def resumable(self, key, run_id=None):
+        # Only a retry of the same run picks up its checkpoint, and only while it is recent.
+        # Anything else is dropped so the crawl starts again from the newest page.
+        with self.lock:
+            self.checkpoints = self.load()
+            checkpoint = self.checkpoints.get(key)
+            if checkpoint is None:
+                return None
+            age = datetime.now() - datetime.fromisoformat(checkpoint["updated_on"])
+            if checkpoint.get("run_id") == run_id and age <= timedelta(hours=self.max_age_hours):
+                return checkpoint
+            del self.checkpoints[key]
+            self.save()
+        print(f"Discarding checkpoint from {checkpoint['updated_on']} (run {checkpoint.get('run_id')}), starting from page 1.")
+        return None
+
+    def update(self, key, page, job_keys, pending_writes, top_keys=None, top_date=None, run_id=None):
+        checkpoint = {
+            "run_id": run_id,
+            "page": page,
+            "job_keys": list(job_keys),
+            # Rows the writer could not commit yet, in JOB_COLUMNS order
+            "pending_writes": [list(row) for row in pending_writes],
+            "top_keys": list(top_keys or []),
+            "top_date": top_date,
+            "updated_on": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.lock:
+            self.checkpoints = self.load()
+            self.checkpoints[key] = checkpoint
+            self.save()
+
+    def clear(self, key):
+        with self.lock:
+            self.checkpoints = self.load()
+            if self.checkpoints.pop(key, None) is not None:
+                self.save()
+
+    def save(self):
+        # Caller holds the lock. Synced temp file plus rename, a kill never leaves a torn store
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as json_file:
+            json.dump(self.checkpoints, json_file, ensure_ascii=False)
+            json_file.flush()
+            os.fsync(json_file.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,122 @@
+import argparse
+import re
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Per language: patterns with a "days" group, then phrases that mean today.
+# "30+" style counts are taken at their lower bound. Word boundaries keep "Ahoy" or
+# "Inaktiv" from reading as today.
+DATE_RULES = {
+    "en": [
+        r"\b(?P<days>\d+)\+?\s*days?\s+ago\b",
+        r"\b(?:just posted|today|active)\b",
+    ],
+    "de": [
+        r"\bvor\s+(?P<days>\d+)\+?\s*tag(?:en)?\b",
+        r"\b(?:heute|gerade geschaltet|aktiv)\b",
+    ],
+    "nl": [
+        r"\b(?P<days>\d+)\+?\s*dag(?:en)?\s+geleden\b",
+        r"\b(?:zojuist geplaatst|vandaag|actief)\b",
+    ],
+    "fr": [
+        r"\bil y a\s+(?P<days>\d+)\+?\s*jours?\b",
+        r"\b(?:publiée? à l'instant|publiée? aujourd'hui|aujourd'hui|actif|active)\b",
+    ],
+    "es": [
+        r"\bhace\s+(?P<days>\d+)\+?\s*d[ií]as?\b",
+        r"\b(?:publicado recientemente|publicado hoy|hoy|activo)\b",
+    ],
+}
+
+# Indeed subdomains that share a language
+LOCALE_LANGUAGES = {
+    "www": "en", "uk": "en", "in": "en", "ca": "en", "au": "en", "ie": "en", "sg": "en", "nz": "en",
+    "de": "de", "at": "de", "ch": "de",
+    "nl": "nl", "be": "nl",
+    "fr": "fr",
+    "es": "es", "mx": "es", "ar": "es", "cl": "es", "co": "es",
+}
+
+COMPILED_RULES = {
+    language: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for language, patterns in DATE_RULES.items()
+}
+
+def rules_for(locale):
+    # The locale's own language first, then the rest for pages served in another language.
+    # Every day count is tried before any "today" phrase, "Active 5 days ago" on a French
+    # page would otherwise match the French "active".
+    language = LOCALE_LANGUAGES.get(locale, locale)
+    languages = [language] if language in COMPILED_RULES else []
+    languages += [other for other in COMPILED_RULES if other != language]
+    for index in range(2):
+        for other in languages:
+            yield COMPILED_RULES[other][index]
+
+@lru_cache(maxsize=4096)
+def days_ago(date_text, locale=None):
+    # Only a handful of distinct phrases show up on a results page, so this is mostly cache hits
+    if not date_text:
+        return None
+    text = " ".join(date_text.split())
+    for rule in rules_for(locale):
+        match = rule.search(text)
+        if match:
+            days = match.groupdict().get("days")
+            return int(days) if days else 0
+    return None
+
+class PostDateParser:
+    # One reference "now" per scrape, so every card on every page is dated against the same day
+    def __init__(self, now=None):
+        self.today = (now or datetime.now()).date()
+        self.dates = {}
+
+    def parse(self, date_text, locale=None):
+        days = days_ago(date_text, locale)
+        if days is None:
+            return None
+        date = self.dates.get(days)
+        if date is None:
+            date = self.dates[days] = (self.today - timedelta(days=days)).strftime("%Y-%m-%d")
+        return date
+
+SAMPLE_PHRASES = [
+    ("Just posted", "in"), ("Today", "www"), ("Posted\n3 days ago", "in"), ("Posted 30+ days ago", "uk"),
+    ("Employer\nActive 2 days ago", "www"), ("Heute", "de"), ("Vor 5 Tagen", "de"), ("Vor 30+ Tagen", "de"),
+    ("Vandaag", "nl"), ("1 dag geleden", "nl"), ("30+ dagen geleden", "nl"), ("Publiée à l'instant", "fr"),
+    ("Il y a 4 jours", "fr"), ("Hace 7 días", "es"), ("Hoy", "es"), ("Hace 30+ días", "mx"),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse Indeed posting dates, or benchmark the parser")
+    parser.add_argument("phrases", nargs="*", help="Phrases to parse, runs the benchmark when omitted")
+    parser.add_argument("--locale", default=None, help="Indeed locale of the phrases, e.g. de, nl, fr")
+    parser.add_argument("--repeat", type=int, default=20000, help="Benchmark rounds over the sample phrases")
+
+    args = parser.parse_args()
+
+    date_parser = PostDateParser()
+    if args.phrases:
+        for phrase in args.phrases:
+            print(f"{phrase!r}: {date_parser.parse(phrase, args.locale)}")
+    else:
+        for phrase, locale in SAMPLE_PHRASES:
+            print(f"{locale:>3} {phrase!r}: {date_parser.parse(phrase, locale)}")
+
+        calls = args.repeat * len(SAMPLE_PHRASES)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for phrase, locale in SAMPLE_PHRASES:
+                days_ago.__wrapped__(phrase, locale)
+        uncached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for phrase, locale in SAMPLE_PHRASES:
+                date_parser.parse(phrase, locale)
+        cached = time.perf_counter() - start
+
+        print(f"\n{calls} parses: {uncached / calls * 1e6:.2f} us each compiled, {cached / calls * 1e6:.2f} us each memoized")
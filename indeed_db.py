@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from dotenv import load_dotenv
+load_dotenv()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    # One pool per process, shared by scrapers, the manager and the GUI
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name="indeed_jobs",
+                pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                pool_reset_session=True,
+                host=os.getenv("DB_HOST"),
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASSWORD"),
+                database=os.getenv("DB_NAME")
+            )
+        return _pool
+
+def get_connection(timeout=30):
+    # The pool raises as soon as it is exhausted, wait for a connection to come back instead
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return get_pool().get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+@contextmanager
+def connection():
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        # Returns the connection to the pool
+        conn.close()
+
+@contextmanager
+def cursor(conn, commit=False, **kwargs):
+    cur = conn.cursor(**kwargs)
+    try:
+        yield cur
+        if commit:
+            conn.commit()
+    except mysql.connector.Error:
+        if commit:
+            conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+class PreparedStatements:
+    # Server-side prepared statements, prepared once per connection and reused by SQL text
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursors = {}
+
+    def execute(self, sql, params=()):
+        cur = self.cursors.get(sql)
+        if cur is None:
+            cur = self.cursors[sql] = self.conn.cursor(prepared=True)
+        cur.execute(sql, params)
+        return cur
+
+    def close(self):
+        for cur in self.cursors.values():
+            cur.close()
+        self.cursors = {}
@@ -0,0 +1,132 @@
+import argparse
+import gzip
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import urllib3
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en,de;q=0.8,nl;q=0.6",
+}
+
+class FetchError(Exception):
+    # status is None when no response came back (refused, timed out, retries exhausted)
+    def __init__(self, url, status, reason=None):
+        super().__init__(f"HTTP {status} for {url}" if status is not None else f"{reason} for {url}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+
+class HttpFetcher:
+    # Keep-alive connection pool for server-rendered result pages, safe to share between threads
+    def __init__(self, max_connections=8, timeout=15, retries=2, base_url=None, headers=None):
+        self.max_connections = max_connections
+        # base_url points every request at a stand-in server, e.g. http://127.0.0.1:8765
+        self.base_url = base_url
+        request_headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        request_headers.update(urllib3.util.make_headers(accept_encoding=True))
+        self.pool = urllib3.PoolManager(
+            num_pools=20,
+            maxsize=max_connections,
+            block=True,
+            headers=request_headers,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        )
+
+    def rewrite(self, url):
+        if not self.base_url:
+            return url
+        base = urlsplit(self.base_url)
+        parts = urlsplit(url)
+        return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+    def fetch(self, url):
+        try:
+            response = self.pool.request("GET", self.rewrite(url), decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise FetchError(url, None, e) from e
+        if response.status >= 400:
+            raise FetchError(url, response.status)
+        return response.data.decode("utf-8", errors="replace")
+
+    def fetch_many(self, urls):
+        # Results come back in the order of urls, exceptions are returned in place
+        def fetch_one(url):
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            return list(executor.map(fetch_one, urls))
+
+    def close(self):
+        self.pool.clear()
+
+class RecordedPageHandler(BaseHTTPRequestHandler):
+    # Serves start-<offset>.html from the fixture directory, falling back to default.html
+    directory = "."
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        start = query.get("start", ["0"])[0]
+        candidates = [f"start-{start}.html", "default.html"]
+        for name in candidates:
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                with open(path, "rb") as html_file:
+                    body = html_file.read()
+                break
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_recorded_pages(directory, port=8765):
+    handler = type("Handler", (RecordedPageHandler,), {"directory": directory})
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP fetch backend utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve recorded result pages as a stand-in for Indeed")
+    serve_parser.add_argument("directory", help="Directory with start-<offset>.html / default.html files")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    fetch_parser = subparsers.add_parser("fetch", help="Fetch URLs through the pooled client and time them")
+    fetch_parser.add_argument("urls", nargs="+")
+    fetch_parser.add_argument("--base-url", default=None)
+    fetch_parser.add_argument("--connections", type=int, default=8)
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = serve_recorded_pages(args.directory, args.port)
+        print(f"Serving {args.directory} on http://127.0.0.1:{args.port}")
+        server.serve_forever()
+    else:
+        fetcher = HttpFetcher(args.connections, base_url=args.base_url)
+        start = time.perf_counter()
+        pages = fetcher.fetch_many(args.urls)
+        elapsed = time.perf_counter() - start
+        for url, page in zip(args.urls, pages):
+            print(f"{url}: {page if isinstance(page, Exception) else f'{len(page)} chars'}")
+        print(f"Fetched {len(pages)} pages in {elapsed:.2f}s")
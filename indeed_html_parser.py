@@ -0,0 +1,166 @@
+import argparse
+import json
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Elements that never get a closing tag
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# data-testid attributes read from each card, same selectors as extract_job_details
+FIELD_TEST_IDS = {
+    "company-name": "company",
+    "text-location": "location",
+    "myJobsStateDate": "date",
+}
+CAPTURED_FIELDS = ("title", "company", "location", "date")
+
+def has_class(attrs, name):
+    return name in (attrs.get("class") or "").split()
+
+def clean_text(parts):
+    text = " ".join("".join(parts).split())
+    return text or None
+
+class JobCardHTMLParser(HTMLParser):
+    def __init__(self, base_url=None):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.records = []
+        self.card = None
+        self.stack = []
+        self.captures = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        role = None
+
+        if self.card is None:
+            if tag == "div" and has_class(attrs, "job_seen_beacon"):
+                self.card = {"title": None, "company": None, "link": None, "location": None, "date": None}
+                role = "card"
+        elif tag == "h2" and has_class(attrs, "jobTitle"):
+            role = "jobTitle"
+        elif tag == "span" and self.card["title"] is None and "title" not in self.captures \
+                and any(entry[1] == "jobTitle" for entry in self.stack):
+            # h2.jobTitle span, the link is the span's parent anchor
+            parent_tag, _, parent_attrs = self.stack[-1] if self.stack else (None, None, {})
+            if parent_tag == "a" and parent_attrs.get("href"):
+                href = parent_attrs["href"]
+                self.card["link"] = urljoin(self.base_url, href) if self.base_url else href
+            role = "title"
+        else:
+            field = FIELD_TEST_IDS.get(attrs.get("data-testid"))
+            if field and self.card[field] is None and field not in self.captures:
+                role = field
+
+        if role in CAPTURED_FIELDS:
+            self.captures[role] = []
+
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, role, attrs if tag == "a" else {}))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            # Self-closed element such as <span/>: nothing to capture
+            return
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Tolerate unbalanced markup by unwinding to the matching open element
+        if not any(entry[0] == tag for entry in self.stack):
+            return
+        while self.stack:
+            open_tag, role, _ = self.stack.pop()
+            self.close_role(role)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for parts in self.captures.values():
+            parts.append(data)
+
+    def close_role(self, role):
+        if role in self.captures:
+            self.card[role] = clean_text(self.captures.pop(role))
+        elif role == "card":
+            self.records.append(self.card)
+            self.card = None
+            self.captures = {}
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.close_role(self.stack.pop()[1])
+
+def parse_with_lxml(html, base_url=None):
+    document = lxml.html.fromstring(html)
+    records = []
+
+    def first_text(card, xpath):
+        found = card.xpath(xpath)
+        return clean_text([found[0].text_content()]) if found else None
+
+    for card in document.xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' job_seen_beacon ')]"):
+        title_spans = card.xpath(".//h2[contains(concat(' ', normalize-space(@class), ' '), ' jobTitle ')]//span")
+        link = None
+        title = None
+        if title_spans:
+            title = clean_text([title_spans[0].text_content()])
+            parent = title_spans[0].getparent()
+            if parent is not None and parent.tag == "a" and parent.get("href"):
+                link = urljoin(base_url, parent.get("href")) if base_url else parent.get("href")
+
+        records.append({
+            "title": title,
+            "company": first_text(card, './/*[@data-testid="company-name"]'),
+            "link": link,
+            "location": first_text(card, './/*[@data-testid="text-location"]'),
+            "date": first_text(card, './/*[@data-testid="myJobsStateDate"]'),
+        })
+
+    return records
+
+def parse_job_cards(html, base_url=None, parser="auto"):
+    if parser == "lxml" or (parser == "auto" and lxml is not None):
+        if lxml is None:
+            raise ImportError("lxml is not installed, use parser='python'")
+        return parse_with_lxml(html, base_url)
+
+    card_parser = JobCardHTMLParser(base_url)
+    card_parser.feed(html)
+    card_parser.close()
+    return card_parser.records
+
+def parse_file(file_path, base_url=None, parser="auto"):
+    with open(file_path, "r", encoding="utf-8") as html_file:
+        return parse_job_cards(html_file.read(), base_url, parser)
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Parse saved Indeed result pages offline")
+    arg_parser.add_argument("files", nargs="+", help="Saved results page HTML files")
+    arg_parser.add_argument("--base-url", default=None, help="Base URL for relative job links, e.g. https://de.indeed.com")
+    arg_parser.add_argument("--parser", choices=["auto", "lxml", "python"], default="auto", help="HTML parser to use")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="Parse each file this many times and report timings")
+
+    args = arg_parser.parse_args()
+
+    for file_path in args.files:
+        with open(file_path, "r", encoding="utf-8") as html_file:
+            html = html_file.read()
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            records = parse_job_cards(html, args.base_url, args.parser)
+        elapsed = (time.perf_counter() - start) / args.repeat
+
+        if args.repeat == 1:
+            print(json.dumps(records, ensure_ascii=False, indent=2))
+        print(f"{file_path}: {len(records)} cards, {elapsed * 1000:.2f} ms per parse")
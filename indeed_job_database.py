@@ -1,175 +1,342 @@
 import argparse
 import csv
-import mysql.connector
+import gzip
+import json
+import sys
 from prettytable import PrettyTable
 import datetime
-import os
 from dotenv import load_dotenv
+from indeed_storage import STORAGE_BACKENDS, get_storage
+from indeed_parquet_export import IndeedSnapshotExporter
 load_dotenv()
 
+SEARCH_MODES = ["contains", "prefix", "fulltext"]
+EXPORT_FIELDS = ["id", "title", "company", "job_link", "location", "date_of_post", "search_query", "job_type"]
+VIEW_FIELDS = ["id", "title", "company", "job_link", "location", "date_of_post", "created_on"]
+
+# Sort name: (column, descending); date sorts break ties on id so every row has a unique position
+SORT_ORDERS = {
+    "newest": ("date_of_post", True),
+    "oldest": ("date_of_post", False),
+    "id": ("id", False),
+    "id-desc": ("id", True),
+}
+
+class JobQuery:
+    # One builder for the view, count, export and delete statements. Pages are keyset ranges
+    # (after the last row's date and id) so deep pages cost the same as the first, no OFFSET scans.
+    def __init__(self, storage, location=None, title=None, search_mode="contains", job_type=None,
+                 date_from=None, date_to=None, until_id=None, sort="id", fields=EXPORT_FIELDS):
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort '{sort}', use one of {', '.join(SORT_ORDERS)}")
+        self.storage = storage
+        self.sort = sort
+        self.fields = list(fields)
+        self.conditions = []
+        self.params = []
+        for column, value in (("location_search", location), ("title_search", title)):
+            # Blank filters match everything, like leaving them out
+            value = (value or "").strip()
+            if value:
+                # Each backend matches with its own index: MySQL FULLTEXT, SQLite FTS5
+                condition, param = storage.search_condition(column, value, search_mode)
+                self.conditions.append(condition)
+                self.params.append(param)
+        # Rows store the lowercase value select_job_type maps "Fulltime" etc. to
+        job_type = (job_type or "").strip().lower() or None
+        for condition, value in (("job_type = %s", job_type), ("id <= %s", until_id),
+                                 ("date_of_post >= %s", date_from), ("date_of_post <= %s", date_to)):
+            if value is not None:
+                self.conditions.append(condition)
+                self.params.append(value)
+
+    def keyset(self, after_date=None, after_id=None):
+        # Rows that come after (after_date, after_id) in the sort order
+        column, descending = SORT_ORDERS[self.sort]
+        op = "<" if descending else ">"
+        if column == "id":
+            return (f"id {op} %s", [after_id]) if after_id is not None else (None, [])
+        if after_date is None and after_id is None:
+            return None, []
+        if after_date is None:
+            # NULL dates sort first ascending and last descending, on both backends
+            if descending:
+                return "(date_of_post IS NULL AND id < %s)", [after_id]
+            return "(date_of_post IS NOT NULL OR id > %s)", [after_id]
+        nulls = " OR date_of_post IS NULL" if descending else ""
+        if after_id is None:
+            return f"(date_of_post {op} %s{nulls})", [after_date]
+        return f"(date_of_post {op} %s OR (date_of_post = %s AND id {op} %s){nulls})", [after_date, after_date, after_id]
+
+    def where(self, after_date=None, after_id=None):
+        condition, params = self.keyset(after_date, after_id)
+        conditions = self.conditions + ([condition] if condition else [])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, tuple(self.params + params)
+
+    def order_by(self):
+        column, descending = SORT_ORDERS[self.sort]
+        direction = " DESC" if descending else ""
+        if column == "id":
+            return f"ORDER BY id{direction}"
+        return f"ORDER BY {column}{direction}, id{direction}"
+
+    def select(self, after_date=None, after_id=None, limit=None):
+        where, params = self.where(after_date, after_id)
+        sql = f"""
+            SELECT {', '.join(self.fields)}
+            FROM indeed_jobs
+            {where}
+            {self.order_by()}
+        """
+        if limit is not None:
+            sql += "LIMIT %s"
+            params += (limit,)
+        return sql, params
+
+    def cursor_of(self, row):
+        # (after_date, after_id) of the next page
+        column, _ = SORT_ORDERS[self.sort]
+        after_date = row[self.fields.index(column)] if column != "id" else None
+        return after_date, row[self.fields.index("id")]
+
+    def count(self):
+        where, params = self.where()
+        return self.storage.fetch_all(f"SELECT COUNT(*) FROM indeed_jobs {where}", params)[0][0]
+
+    def delete(self):
+        where, params = self.where()
+        return self.storage.execute(f"""
+            DELETE FROM indeed_jobs
+            {where}
+        """, params)
+
+    def pages(self, after_date=None, after_id=None, limit=None, page_size=100):
+        # Every page after the first runs the same statement text, so MySQL prepares it once
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            sql, params = self.select(after_date, after_id, size)
+            rows = self.storage.fetch_prepared(sql, params)
+            if not rows:
+                return
+            yield rows
+            if len(rows) < size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            after_date, after_id = self.cursor_of(rows[-1])
+
+    def rows(self, after_date=None, after_id=None, limit=None, page_size=100):
+        for rows in self.pages(after_date, after_id, limit, page_size):
+            yield from rows
+
+    def stream(self, after_id=None, chunk_size=1000):
+        # One streaming statement in id order, for exports
+        sql, params = self.select(after_id=after_id)
+        return self.storage.stream(sql, params, chunk_size)
+
 class IndeedJobDatabaseManager:
-    def __init__(self):
-        self.conn = None
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage()
         self.connect_to_database()
 
     def connect_to_database(self):
         try:
-            
-            print(os.getenv("DB_HOST"))
-            print(os.getenv("DB_USER"))
-            print(os.getenv("DB_PASSWORD"))
-            print(os.getenv("DB_NAME"))
-
-            self.conn = mysql.connector.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_NAME")
-            )
+            self.storage.connect()
             print("Connected to the database")
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
-    def view_data(self, location, title):
+    def close(self):
+        self.storage.close()
+
+    def migrate(self):
         try:
-            cursor = self.conn.cursor()
-            if not title and location:
-                # Only location provided
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, created_on
-                    FROM indeed_jobs
-                    WHERE location_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{location}%",))
-
-            elif title and not location:
-                # Only title provided
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, created_on
-                    FROM indeed_jobs
-                    WHERE title_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{title}%",))
-
-            else:
-                # Both title and location provided
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, created_on
-                    FROM indeed_jobs
-                    WHERE location_search LIKE %s AND title_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{location}%", f"%{title}%"))
-
-            results = cursor.fetchall()
-
-            if not results:
-                print("No matching data found.")
-                return
+            version = self.storage.migrate()
+        except self.storage.Error as e:
+            print(f"Error: {e}")
+            return
+        if version is not None:
+            print(f"Schema is at version {version}.")
 
-            table = PrettyTable()
-            table.field_names = ["ID", "Title", "Company", "Job Link", "Location", "Date of Post", "created_on"]
+    def query(self, location=None, title=None, search_mode="contains", job_type=None, date_from=None, date_to=None,
+              after_date=None, after_id=None, until_id=None, sort="newest", limit=None, page_size=100, fields=VIEW_FIELDS):
+        # Lazy rows, fetched one keyset page at a time
+        job_query = JobQuery(self.storage, location, title, search_mode, job_type, date_from, date_to, until_id, sort, fields)
+        return job_query.rows(after_date, after_id, limit, page_size)
 
-            for row in results:
-                table.add_row(row)
+    def count(self, location=None, title=None, search_mode="contains", job_type=None, date_from=None, date_to=None,
+              until_id=None):
+        return JobQuery(self.storage, location, title, search_mode, job_type, date_from, date_to, until_id).count()
 
-            print(table)
+    def view_data(self, location, title, search_mode="contains", job_type=None, date_from=None, date_to=None,
+                  after_date=None, after_id=None, until_id=None, sort="newest", limit=None, page_size=50, interactive=None):
+        if interactive is None:
+            interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        shown = 0
+        try:
+            job_query = JobQuery(self.storage, location, title, search_mode, job_type, date_from, date_to, until_id,
+                                 sort, VIEW_FIELDS)
+            for rows in job_query.pages(after_date, after_id, limit, page_size):
+                # One page in memory and on screen at a time
+                table = PrettyTable()
+                table.field_names = ["ID", "Title", "Company", "Job Link", "Location", "Date of Post", "created_on"]
+                for row in rows:
+                    table.add_row(row)
+                print(table)
+
+                shown += len(rows)
+                next_date, next_id = job_query.cursor_of(rows[-1])
+                resume = f"--after-id {next_id}" + (f" --after-date {next_date}" if next_date is not None else "")
+                print(f"Rows {shown - len(rows) + 1}-{shown}, next page with --sort {sort} {resume}")
+                if interactive and len(rows) == page_size and \
+                        input("Enter for the next page, q to quit: ").strip().lower() == "q":
+                    break
 
-        except mysql.connector.Error as e:
+            if not shown:
+                print("No matching data found.")
+
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
-    def delete_data(self, location, title):
+    def delete_data(self, location, title, search_mode="contains", delete_all=False):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                DELETE FROM indeed_jobs
-                WHERE location_search LIKE %s AND title_search LIKE %s
-            """, (f"%{location}%", f"%{title}%"))
-
-            self.conn.commit()
+            job_query = JobQuery(self.storage, location, title, search_mode)
+            # Only the GUI's clear deletes everything, blank filters from the CLI are refused
+            if not job_query.conditions and not delete_all:
+                print("Provide a location and/or title filter to delete.")
+                return
+            job_query.delete()
             print(f"Data deleted successfully.")
 
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
     def clear_table(self):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("TRUNCATE TABLE indeed_jobs")
-            cursor.execute("ALTER TABLE indeed_jobs AUTO_INCREMENT = 1")  # Reset auto-increment primary key
-            self.conn.commit()
+            self.storage.clear()
             print("Table indeed_jobs cleared successfully.")
 
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
-    def export_data(self, location, title):
+    def iter_rows(self, location, title, search_mode="contains", after_id=None, until_id=None,
+                  date_from=None, date_to=None, chunk_size=1000, fields=EXPORT_FIELDS, job_type=None):
+        # Id order, so exports can be resumed or split with after_id/until_id
+        job_query = JobQuery(self.storage, location, title, search_mode, job_type, date_from, date_to, until_id,
+                             "id", fields)
+        return job_query.stream(after_id, chunk_size)
+
+    def export_data(self, location, title, search_mode="contains", output_format="csv", compress=False,
+                    after_id=None, until_id=None, date_from=None, date_to=None, chunk_size=1000, job_type=None):
+        export_file = None
+        export_file_path = None
+        exported = 0
+        last_id = None
+
         try:
-            cursor = self.conn.cursor()
-            if not title and location:
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, search_query, job_type
-                    FROM indeed_jobs
-                    WHERE location_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{location}%",))
-
-            elif title and not location:
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, search_query, job_type
-                    FROM indeed_jobs
-                    WHERE title_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{title}%",))
-
-            else:
-                cursor.execute("""
-                    SELECT id, title, company, job_link, location, date_of_post, search_query, job_type
-                    FROM indeed_jobs
-                    WHERE location_search LIKE %s AND title_search LIKE %s
-                    ORDER BY date_of_post DESC
-                """, (f"%{location}%", f"%{title}%"))
-
-            results = cursor.fetchall()
-
-            if not results:
-                print("No matching data found for export.")
-                return
+            for rows in self.iter_rows(location, title, search_mode, after_id, until_id, date_from, date_to, chunk_size,
+                                       job_type=job_type):
+                if export_file is None:
+                    # Generate a unique timestamp
+                    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+                    export_file_path = f"export_{location}_{title}_jobs_{timestamp}.{output_format}"
+                    if compress:
+                        export_file_path += ".gz"
+                        export_file = gzip.open(export_file_path, "wt", newline="", encoding="utf-8")
+                    else:
+                        export_file = open(export_file_path, "w", newline="", encoding="utf-8")
 
-            # Generate a unique timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            export_file_path = f"export_{location}_{title}_jobs_{timestamp}.csv"
+                    if output_format == "csv":
+                        writer = csv.writer(export_file)
+                        writer.writerow(EXPORT_FIELDS)
 
-            with open(export_file_path, 'w', newline='') as csvfile:
-                fieldnames = ["id", "title", "company", "job_link", "location", "date_of_post", "search_query", "job_type"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                if output_format == "csv":
+                    writer.writerows(rows)
+                else:
+                    export_file.write("".join(
+                        json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, default=str) + "\n"
+                        for row in rows
+                    ))
+                exported += len(rows)
+                last_id = rows[-1][0]
 
-                writer.writeheader()
-                for row in results:
-                    # Extract only the relevant fields present in 'fieldnames'
-                    writer.writerow(dict(zip(fieldnames, row)))
+            if export_file is None:
+                print("No matching data found for export.")
+                return None
 
-            print(f"Data exported to {export_file_path}")
+            # last id can be passed back as --after-id to resume or split an export
+            print(f"Data exported to {export_file_path} ({exported} rows, last id {last_id})")
+            return export_file_path
 
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
+            print(f"Error: {e}")
+            if last_id is not None:
+                print(f"Export stopped after id {last_id}, resume with --after-id {last_id}")
+        finally:
+            if export_file is not None:
+                export_file.close()
+
+    def snapshot_data(self, location, title, search_mode="contains", output_format="parquet",
+                      incremental=False, output_dir="snapshots"):
+        try:
+            exporter = IndeedSnapshotExporter(self, output_dir)
+            return exporter.export(location, title, search_mode, output_format, incremental)
+        except ImportError as e:
+            print(f"Error: {e}")
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Manage Indeed job database")
-    parser.add_argument("command", choices=["view", "delete", "clear", "export"], help="Command to execute")
+    parser.add_argument("command", choices=["view", "delete", "clear", "export", "migrate"], help="Command to execute")
     parser.add_argument("--location", help="Location filter")
     parser.add_argument("--title", help="Title filter")
+    parser.add_argument("--search-mode", choices=SEARCH_MODES, default="contains", help="How filters match: substring, prefix (indexed) or fulltext")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet", "arrow"], default="csv", help="Export file format, parquet and arrow write a date-partitioned snapshot")
+    parser.add_argument("--incremental", action="store_true", help="Snapshot only rows added since the last parquet/arrow snapshot")
+    parser.add_argument("--output-dir", default="snapshots", help="Directory for parquet/arrow snapshots")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the export")
+    parser.add_argument("--job-type", help="Only jobs scraped with this job type: Fulltime, Permanent, Parttime or Subcontract")
+    parser.add_argument("--after-id", type=int, help="Only rows after this id, in the --sort order for view")
+    parser.add_argument("--after-date", help="With a date --sort, only rows after this date and --after-id, as printed by view")
+    parser.add_argument("--until-id", type=int, help="Only rows with an id up to this")
+    parser.add_argument("--date-from", help="Only jobs posted on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--date-to", help="Only jobs posted on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--sort", choices=list(SORT_ORDERS), default="newest", help="Row order for view, exports are in id order")
+    parser.add_argument("--limit", type=int, help="Show at most this many rows")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per page for view")
+    parser.add_argument("--count", action="store_true", help="With view, only print how many rows match")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows fetched and written per chunk")
+    parser.add_argument("--backend", choices=list(STORAGE_BACKENDS), help="Storage backend, defaults to DB_BACKEND or mysql")
 
     args = parser.parse_args()
 
-    manager = IndeedJobDatabaseManager()
+    manager = IndeedJobDatabaseManager(get_storage(args.backend))
 
-    if args.command == "view":
-        manager.view_data(args.location, args.title)
+    if args.command == "view" and args.count:
+        try:
+            matches = manager.count(args.location, args.title, args.search_mode, args.job_type, args.date_from,
+                                    args.date_to, args.until_id)
+            print(f"{matches} matching rows")
+        except manager.storage.Error as e:
+            print(f"Error: {e}")
+    elif args.command == "view":
+        manager.view_data(args.location, args.title, args.search_mode, args.job_type, args.date_from, args.date_to,
+                          args.after_date, args.after_id, args.until_id, args.sort, args.limit, args.page_size)
     elif args.command == "delete":
-        manager.delete_data(args.location, args.title)
+        manager.delete_data(args.location, args.title, args.search_mode)
     elif args.command == "clear":
         manager.clear_table()
+    elif args.command == "export" and args.format in ("parquet", "arrow"):
+        manager.snapshot_data(args.location, args.title, args.search_mode, args.format, args.incremental, args.output_dir)
     elif args.command == "export":
-        manager.export_data(args.location, args.title)
+        manager.export_data(args.location, args.title, args.search_mode, args.format, args.gzip,
+                            args.after_id, args.until_id, args.date_from, args.date_to, args.chunk_size, args.job_type)
+    elif args.command == "migrate":
+        manager.migrate()
     else:
-        print("Invalid command. Use 'view', 'delete', 'clear', or 'export'.")
+        print("Invalid command. Use 'view', 'delete', 'clear', 'export' or 'migrate'.")
+
+    manager.close()
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import sys
+from array import array
+
+from indeed_job_writer import job_key_from_link
+
+def canonical_job_link(job_link, locale):
+    # Drop the per-impression tracking parameters (bb, xkcb, ...) so the same
+    # posting always has the same link
+    jk = job_key_from_link(job_link)
+    if jk is None:
+        return job_link
+    return f"https://{locale}.indeed.com/viewjob?jk={jk}"
+
+def job_key_value(jk):
+    # A jk is 16 hex digits, which packs into one unsigned 64-bit integer
+    try:
+        if len(jk) <= 16:
+            return int(jk, 16)
+    except ValueError:
+        pass
+    return int(hashlib.sha1(jk.encode("utf-8")).hexdigest()[:16], 16)
+
+class SeenJobIndex:
+    # On disk: a flat, append-only array of little-endian uint64 job keys
+    def __init__(self, path="seen_jobs.idx"):
+        self.path = path
+        self.keys = set()
+        self.pending = array("Q")
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        values = array("Q")
+        with open(self.path, "rb") as index_file:
+            data = index_file.read()
+        # Ignore a torn trailing write
+        values.frombytes(data[:len(data) - len(data) % values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.keys = set(values)
+        print(f"Loaded {len(self.keys)} known jobs from {self.path}.")
+
+    def __contains__(self, jk):
+        return job_key_value(jk) in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, jk):
+        value = job_key_value(jk)
+        if value not in self.keys:
+            self.keys.add(value)
+            self.pending.append(value)
+
+    def discard_pending(self):
+        for value in self.pending:
+            self.keys.discard(value)
+        self.pending = array("Q")
+
+    def save(self):
+        if not self.pending:
+            return
+
+        values, self.pending = self.pending, array("Q")
+        if sys.byteorder == "big":
+            values.byteswap()
+        with open(self.path, "ab") as index_file:
+            index_file.write(values.tobytes())
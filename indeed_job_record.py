@@ -0,0 +1,39 @@
+import sys
+
+# Keys used by job_data.json and everything that consumed the old per-card dicts
+LEGACY_KEYS = {
+    "title": "Title",
+    "company": "Company",
+    "job_link": "Job Link",
+    "location": "Location",
+    "date": "Date",
+}
+
+def intern_text(value):
+    # Companies, locations and dates repeat across thousands of cards, keep one copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+class JobRecord:
+    __slots__ = ("title", "company", "job_link", "location", "date")
+
+    def __init__(self, title, company, job_link, location, date):
+        self.title = title
+        self.company = intern_text(company)
+        self.job_link = job_link
+        self.location = intern_text(location)
+        self.date = intern_text(date)
+
+    @classmethod
+    def from_dict(cls, job_data):
+        return cls(*(job_data.get(key) for key in LEGACY_KEYS.values()))
+
+    def to_dict(self):
+        return {legacy_key: getattr(self, field) for field, legacy_key in LEGACY_KEYS.items()}
+
+    def __eq__(self, other):
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r}, {self.company!r}, {self.job_link!r}, {self.location!r}, {self.date!r})"
@@ -0,0 +1,60 @@
+import queue
+import threading
+import time
+import traceback
+
+class BackgroundJobRunner:
+    # Runs queued jobs one at a time on a worker thread. Jobs report back through
+    # self.events, which the GUI drains from the Tk main loop.
+    def __init__(self):
+        self.tasks = queue.Queue()
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.current = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, label, func, *args):
+        # func is called as func(*args, progress=..., cancel_event=...)
+        self.tasks.put((label, func, args))
+        self.events.put(("queued", label, self.queued()))
+
+    def queued(self):
+        return self.tasks.qsize()
+
+    def cancel(self):
+        # Stops the running job at its next checkpoint
+        self.cancel_event.set()
+
+    def cancel_all(self):
+        while True:
+            try:
+                label, _, _ = self.tasks.get_nowait()
+            except queue.Empty:
+                break
+            self.tasks.task_done()
+            self.events.put(("cancelled", label, None))
+        self.cancel()
+
+    def run(self):
+        while True:
+            label, func, args = self.tasks.get()
+            self.cancel_event.clear()
+            self.current = label
+            self.events.put(("started", label, None))
+            start = time.monotonic()
+
+            def progress(info, label=label):
+                info = dict(info, elapsed=time.monotonic() - start)
+                self.events.put(("progress", label, info))
+
+            try:
+                result = func(*args, progress=progress, cancel_event=self.cancel_event)
+                kind = "cancelled" if self.cancel_event.is_set() else "done"
+                self.events.put((kind, label, result))
+            except Exception as e:
+                traceback.print_exc()
+                self.events.put(("error", label, str(e)))
+            finally:
+                self.current = None
+                self.tasks.task_done()
@@ -1,123 +1,254 @@
 import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 import time
 import json
-import mysql.connector
 import os
 from dotenv import load_dotenv
 load_dotenv()
 import traceback
-from datetime import datetime, timedelta
+from indeed_dates import PostDateParser
+from indeed_metrics import METRICS
+from indeed_page_readiness import PageReadinessWaiter
+from indeed_browser_pool import create_chrome_driver
+from indeed_fetchers import FetchError, HttpFetcher
+from indeed_html_parser import parse_job_cards
+from indeed_job_writer import IndeedJobWriter, job_key_from_link
+from indeed_job_index import SeenJobIndex, canonical_job_link
+from indeed_job_record import JobRecord
+from indeed_jsonl_sink import JsonlJobSink
+from indeed_watermarks import CrawlWatermarkStore, crossed_watermark
+from indeed_checkpoints import CrawlCheckpointStore
+from indeed_storage import get_storage
+from indeed_rate_control import PageBlockedError, RateController, is_block_page
+
+# Pulls every card on the results page in a single round trip. Fields that are
+# missing come back as null instead of blocking on a WebDriverWait.
+BULK_EXTRACT_SCRIPT = """
+return Array.from(document.querySelectorAll('div.job_seen_beacon')).map(function (card) {
+    function text(selector) {
+        var element = card.querySelector(selector);
+        return element ? element.innerText.trim() : null;
+    }
+    var titleSpan = card.querySelector('h2.jobTitle span');
+    var anchor = titleSpan ? titleSpan.parentElement : null;
+    return {
+        title: titleSpan ? titleSpan.innerText.trim() : null,
+        company: text('[data-testid="company-name"]'),
+        link: anchor && anchor.tagName === 'A' ? anchor.href : null,
+        location: text('[data-testid="text-location"]'),
+        date: text('[data-testid="myJobsStateDate"]')
+    };
+});
+"""
 
 class IndeedJobScraper:
-    def __init__(self):
+    def __init__(self, seen_index_path="seen_jobs.idx", browser_pool=None, fetch_backends=None, http_fetcher=None,
+                 storage=None, output_sink=None, rate_controller=None):
         self.job_data_list = []
-        self.processed_job_links = set()
+        # Canonical jk job ids seen in this process, plus the ones stored by earlier runs
+        self.processed_job_keys = set()
+        self.seen_index = SeenJobIndex(seen_index_path)
+        self.watermarks = CrawlWatermarkStore()
+        self.checkpoints = CrawlCheckpointStore()
+        self.last_page_keys = []
+        self.readiness = PageReadinessWaiter()
+        self.date_parser = PostDateParser()
+        # Optional callable(locale), called before every page load to wait for a rate budget
+        self.page_gate = None
+        # Per-host pacing and backoff, share one controller between scrapers hitting the same hosts
+        self.rate_controller = rate_controller or RateController()
+        self.extraction = "script"
         
-        self.conn = None
+        # MySQL unless DB_BACKEND says otherwise, see indeed_storage
+        self.storage = storage or get_storage()
 
         self.connect_to_database() 
         self.create_jobs_table()
-
-        options = Options()
-        options.headless = True
-        options.add_argument("--window-size=3,2")
-
-        self.driver = webdriver.Chrome(options=options)
+        self.writer = IndeedJobWriter(self.storage)
+        # Optional JsonlJobSink, gets each page's new jobs when the page is flushed
+        self.output_sink = output_sink
+        self.pending_output = []
+
+        # Browsers are started on first use; with a pool they stay warm between scrapes
+        self.browser_pool = browser_pool
+        self.driver = None
+        self.pages_loaded = 0
+        # Whether the last iter_jobs ran to the end, errors are printed there and not raised
+        self.completed = False
+
+        # Per-locale fetch backend, "selenium" (default) or "http" for server-rendered locales
+        self.fetch_backends = dict(fetch_backends or {})
+        self.http_fetcher = http_fetcher
+
+    def backend_for(self, locale):
+        return self.fetch_backends.get(locale, self.fetch_backends.get("*", "selenium"))
+
+    def ensure_http_fetcher(self):
+        if self.http_fetcher is None:
+            self.http_fetcher = HttpFetcher()
+        return self.http_fetcher
+
+    def fetch_http_page(self, url, locale):
+        start = time.monotonic()
+        html = self.ensure_http_fetcher().fetch(url)
+        waited = time.monotonic() - start
+        page_jobs, card_count = self.records_to_jobs(parse_job_cards(html, f"https://{locale}.indeed.com"))
+        if card_count == 0 and is_block_page(html):
+            raise PageBlockedError(url)
+        return page_jobs, card_count, waited, "http"
+
+    def acquire_driver(self):
+        if self.driver is None:
+            self.driver = self.browser_pool.acquire() if self.browser_pool else create_chrome_driver()
+            self.pages_loaded = 0
+        return self.driver
+
+    def release_driver(self):
+        if self.driver is None:
+            return
+        driver, self.driver = self.driver, None
+        try:
+            if self.browser_pool:
+                self.browser_pool.release(driver, self.pages_loaded)
+            else:
+                driver.quit()
+        except Exception as e:
+            print(f"Error: {e}")
 
     def connect_to_database(self):
         try:
-
-
-            self.conn = mysql.connector.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_NAME")
-            )
+            self.storage.connect()
             print("Connected to the database")
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
     def create_jobs_table(self):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS indeed_jobs (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    title TEXT,
-                    title_search TEXT,
-                    company TEXT,
-                    job_link TEXT,
-                    job_type TEXT,
-                    location TEXT,
-                    location_search TEXT,
-                    search_query TEXT,
-                    date_of_post TEXT,
-                    created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            self.conn.commit()
+            self.storage.create_jobs_table()
             print("Table 'indeed_jobs' created successfully.")
-        except mysql.connector.Error as e:
+        except self.storage.Error as e:
             print(f"Error: {e}")
 
     def extract_job_details(self, card):
         try:
             job_link_element = card.find_element(By.CSS_SELECTOR, 'h2.jobTitle span')
             job_link = job_link_element.find_element(By.XPATH, './parent::a').get_attribute('href')
+            job_link = canonical_job_link(job_link, self.locale)
         except:
             job_link = "N/A"
-        try:
-            title_element = WebDriverWait(card, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'h2.jobTitle span'))
-            )
-            title = title_element.text
-        except:
-            title = "N/A"
-        try:
-            company_element = WebDriverWait(card, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="company-name"]'))
-            )
-            company = company_element.text
-        except:
-            company = "N/A"
-        try:
-            location_element = WebDriverWait(card, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="text-location"]'))
-            )
-            location = location_element.text
-        except:
-            location = "N/A"
-
-        try:
-            date_element = WebDriverWait(card, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="myJobsStateDate"]'))
-            )
-            date_text = date_element.text
-            date = date_text.replace("Employer", "").strip()
-            date = date.replace("Posted", "").strip()
-            date = convert_date(date)
-        except:
-            date = None
-
-        return {
-            "Title": title,
-            "Company": company,
-            "Job Link": job_link,
-            "Location": location,
-            "Date": date,
-        }
+        if self.is_known_job(job_link):
+            return None
+        with METRICS.timer("indeed_field_extract_seconds", field="title"):
+            try:
+                title_element = WebDriverWait(card, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, 'h2.jobTitle span'))
+                )
+                title = title_element.text
+            except:
+                title = "N/A"
+        with METRICS.timer("indeed_field_extract_seconds", field="company"):
+            try:
+                company_element = WebDriverWait(card, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="company-name"]'))
+                )
+                company = company_element.text
+            except:
+                company = "N/A"
+        with METRICS.timer("indeed_field_extract_seconds", field="location"):
+            try:
+                location_element = WebDriverWait(card, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="text-location"]'))
+                )
+                location = location_element.text
+            except:
+                location = "N/A"
+
+        with METRICS.timer("indeed_field_extract_seconds", field="date"):
+            try:
+                date_element = WebDriverWait(card, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="myJobsStateDate"]'))
+                )
+                date = self.date_parser.parse(date_element.text, self.locale)
+            except:
+                date = None
+
+        return JobRecord(title, company, job_link, location, date)
+
+    def extract_page_cards(self):
+        if self.extraction == "html":
+            # Grab the rendered page once and parse it without touching live elements
+            with METRICS.timer("indeed_extract_seconds", method="html"):
+                records = parse_job_cards(self.driver.page_source, f"https://{self.locale}.indeed.com")
+            return self.records_to_jobs(records)
+
+        with METRICS.timer("indeed_extract_seconds", method="script"):
+            records = self.driver.execute_script(BULK_EXTRACT_SCRIPT) or []
+        return self.records_to_jobs(records, fallback=True)
+
+    def job_key(self, job_link):
+        return job_key_from_link(job_link) or job_link
+
+    def is_known_job(self, job_link):
+        jk = job_key_from_link(job_link)
+        return jk is not None and (jk in self.processed_job_keys or jk in self.seen_index)
+
+    def records_to_jobs(self, records, fallback=False, locale=None):
+        # Returns the cards that still need work and the total number of cards on the page
+        locale = locale or self.locale
+        job_cards = None
+        page_jobs = []
+        self.last_page_keys = []
+        date_seconds = 0.0
+        dates_parsed = 0
+        unparsed_dates = set()
+
+        for index, record in enumerate(records):
+            job_link = canonical_job_link(record.get("link"), locale)
+            if job_key_from_link(job_link):
+                self.last_page_keys.append(job_key_from_link(job_link))
+            # Already stored jobs are skipped before any date parsing or DB work
+            if self.is_known_job(job_link):
+                continue
+
+            if fallback and (record.get("title") is None or job_link is None):
+                # Malformed card, fall back to the per-field lookups for this one only
+                if job_cards is None:
+                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'div.job_seen_beacon')
+                if index < len(job_cards):
+                    job_data = self.extract_job_details(job_cards[index])
+                    if job_data is not None:
+                        page_jobs.append(job_data)
+                continue
+
+            start = time.perf_counter()
+            date = self.date_parser.parse(record.get("date"), locale)
+            date_seconds += time.perf_counter() - start
+            dates_parsed += 1
+            if date is None:
+                METRICS.inc("indeed_dates_unparsed_total", locale=locale)
+                if record.get("date"):
+                    unparsed_dates.add(" ".join(record["date"].split()))
+
+            page_jobs.append(JobRecord(
+                record.get("title") or "N/A",
+                record.get("company") or "N/A",
+                job_link or "N/A",
+                record.get("location") or "N/A",
+                date,
+            ))
+
+        if dates_parsed:
+            METRICS.observe("indeed_date_parse_seconds", date_seconds, count=dates_parsed, locale=locale)
+        if unparsed_dates:
+            # Jobs without a date are not saved, a new wording on the site shows up here first
+            print(f"Unrecognized posting dates for locale {locale}, those jobs are skipped: "
+                  + ", ".join(repr(text) for text in sorted(unparsed_dates)))
+        return page_jobs, len(records)
     
-    def scrape_jobs(self, designation, location, num_pages = "2", job_type = "fulltime", locale="de", switched_by = "All"):
-        job_type = self.select_job_type(job_type)
-        self.locale = locale
-        self.location = location
-        self.title = designation
+    def search_url(self, designation, location, page, job_type, locale, switched_by="All"):
         language = "in" if locale == "in" else "de" if locale == "de" else ""
 
         if switched_by == "Employer":
@@ -126,44 +257,219 @@ class IndeedJobScraper:
             switched_by_filter = "0bf:exdh(),"
         else:
             switched_by_filter = ""
-                    
-        try:
-            for page in range(0, num_pages):
-                start_index = page * 10  # Each page displays 10 results, adjust as needed
-                # url = f"https://{self.locale}.indeed.com/jobs?q={designation}&l={location}&start={start_index}&fromage=14&sort=date&lang={language}&sc=0kf%3Ajt({job_type})%3B"
-                url = f"https://{self.locale}.indeed.com/jobs?q={designation}&l={location}&start={start_index}&fromage=14&sort=date&lang={language}&sc={switched_by_filter}kf%3Ajt({job_type})%3B"
 
-                self.driver.get(url)
-                time.sleep(7)  # Wait for the page to load (you might need to adjust this time)
-
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'div.job_seen_beacon')
-                print(f"\nPage {page + 1} - Number of job cards found: {len(job_cards)}")
+        start_index = page * 10  # Each page displays 10 results, adjust as needed
+        # url = f"https://{locale}.indeed.com/jobs?q={designation}&l={location}&start={start_index}&fromage=14&sort=date&lang={language}&sc=0kf%3Ajt({job_type})%3B"
+        return f"https://{locale}.indeed.com/jobs?q={designation}&l={location}&start={start_index}&fromage=14&sort=date&lang={language}&sc={switched_by_filter}kf%3Ajt({job_type})%3B"
+
+    def scrape_page(self, designation, location, page, job_type="fulltime", locale="de", switched_by="All"):
+        return self.with_page_retries(locale, page, lambda: self.scrape_page_once(designation, location, page, job_type,
+                                                                                    locale, switched_by))
+
+    def with_page_retries(self, locale, page, load_page):
+        # load_page() returns (result, card_count). Retries only this page: blocks and errors back
+        # off first, and an empty page is retried before it is taken as the end of the results
+        controller = self.rate_controller
+        attempt = 0
+        empty_pages = 0
+        while True:
+            controller.acquire(locale)
+            start = time.monotonic()
+            error = None
+            try:
+                result, card_count = load_page()
+            except PageBlockedError as e:
+                outcome, error = "blocked", e
+            except FetchError as e:
+                outcome, error = ("blocked" if e.status in (403, 429) else "error"), e
+            except WebDriverException as e:
+                outcome, error = "error", e
+                # The browser may be gone, the next attempt gets a fresh or health-checked one
+                self.release_driver()
+            else:
+                if card_count > 0:
+                    controller.record(locale, "ok", time.monotonic() - start)
+                    return result, card_count
+                if empty_pages >= controller.empty_retries:
+                    return result, card_count
+                empty_pages += 1
+                outcome = "empty"
+
+            attempt += 1
+            pause = controller.record(locale, outcome)
+            if attempt > controller.max_retries:
+                if error is not None:
+                    raise error
+                return result, card_count
+            METRICS.inc("indeed_page_retries_total", locale=locale, outcome=outcome)
+            print(f"Retrying page {page + 1} after {outcome} page in {pause:.0f}s (attempt {attempt} of {controller.max_retries}).")
+
+    def scrape_page_once(self, designation, location, page, job_type="fulltime", locale="de", switched_by="All"):
+        # job_type must already be normalized through select_job_type
+        self.locale = locale
+        self.location = location
+        self.title = designation
 
-                for card in job_cards:
-                    job_data = self.extract_job_details(card)
-                    job_link = job_data.get("Job Link", "")
+        url = self.search_url(designation, location, page, job_type, locale, switched_by)
+        backend = self.backend_for(locale)
+        if self.page_gate is not None:
+            self.page_gate(locale)
+        page_start = time.perf_counter()
+        if backend == "http":
+            page_jobs, card_count, waited, reason = self.fetch_http_page(url, locale)
+            load_seconds, wait_seconds, extract_seconds = waited, 0.0, 0.0
+        else:
+            self.acquire_driver().get(url)
+            self.pages_loaded += 1
+            load_seconds = time.perf_counter() - page_start
+            # Wait for the job cards to settle instead of a fixed sleep
+            waited, reason = self.readiness.wait_for_page(self.driver, self.locale)
+            wait_seconds = waited
+            extract_start = time.perf_counter()
+            page_jobs, card_count = self.extract_page_cards()
+            extract_seconds = time.perf_counter() - extract_start
+            if card_count == 0 and is_block_page(self.driver.page_source):
+                raise PageBlockedError(url)
+        METRICS.observe("indeed_page_load_seconds", load_seconds, locale=locale, backend=backend)
+        METRICS.observe("indeed_page_wait_seconds", wait_seconds, locale=locale, reason=reason)
+        METRICS.inc("indeed_pages_total", locale=locale, backend=backend)
+        METRICS.inc("indeed_cards_total", card_count, locale=locale)
+        print(f"\nPage {page + 1} - Number of job cards found: {card_count} (ready after {waited:.2f}s, {reason})")
+        if card_count > len(page_jobs):
+            print(f"Skipped {card_count - len(page_jobs)} already known jobs.")
+
+        new_jobs = []
+        for job_data in page_jobs:
+            job_key = self.job_key(job_data.job_link)
+
+            # Check if the job key is not in the set to avoid duplicates
+            if job_key not in self.processed_job_keys:
+                self.processed_job_keys.add(job_key)
+
+                # Save job data to the database
+                if job_data.date is not None:
+                    new_jobs.append(job_data)
+                    dbURL = f"https://{self.locale}.indeed.com/jobs?q={designation}"
+                    self.save_to_database(job_data, dbURL, job_type)
+
+        # One transaction per page
+        self.flush_writes()
+        METRICS.inc("indeed_jobs_new_total", len(new_jobs), locale=locale)
+        METRICS.trace("page", locale=locale, query=designation, location=location, page=page + 1, backend=backend,
+                      cards=card_count, new=len(new_jobs), reason=reason, load_seconds=round(load_seconds, 4),
+                      wait_seconds=round(wait_seconds, 4), extract_seconds=round(extract_seconds, 4),
+                      total_seconds=round(time.perf_counter() - page_start, 4))
+        return new_jobs, card_count
+
+    def scrape_jobs(self, designation, location, num_pages = "2", job_type = "fulltime", locale="de", switched_by = "All", extraction="script", incremental=False,
+                    progress_callback=None, cancel_event=None, resume=False, run_id=None):
+        # Keeps every record for save_to_json, use iter_jobs to stream them instead
+        for job_data in self.iter_jobs(designation, location, num_pages, job_type, locale, switched_by, extraction, incremental,
+                                       progress_callback, cancel_event, resume, run_id):
+            self.job_data_list.append(job_data)
+
+    def iter_jobs(self, designation, location, num_pages = "2", job_type = "fulltime", locale="de", switched_by = "All", extraction="script", incremental=False,
+                  progress_callback=None, cancel_event=None, resume=False, run_id=None):
+        # Yields each new JobRecord once its page is committed, nothing is retained here
+        job_type = self.select_job_type(job_type)
+        self.extraction = extraction
+        # Every page of this scrape is dated against the same day
+        self.date_parser = PostDateParser()
+        cancelled = False
+        completed = False
+        self.completed = False
+
+        watermark_key = CrawlWatermarkStore.query_key(designation, location, locale, job_type, switched_by)
+        watermark = self.watermarks.get(watermark_key)
+        top_keys = []
+        top_date = None
+
+        # Pick up after the last page an interrupted run completed for this query. run_id names the
+        # scheduled run, a checkpoint left by another run (or one past its max age) is discarded.
+        start_page = 0
+        query_job_keys = []
+        checkpoint = self.checkpoints.resumable(watermark_key, run_id) if resume else None
+        if checkpoint:
+            start_page = checkpoint["page"] + 1
+            query_job_keys = list(checkpoint["job_keys"])
+            self.processed_job_keys.update(query_job_keys)
+            self.writer.pending.extend(tuple(row) for row in checkpoint["pending_writes"])
+            top_keys = checkpoint["top_keys"]
+            top_date = checkpoint["top_date"]
+            print(f"Resuming from page {start_page + 1}, {len(query_job_keys)} jobs already processed.")
 
-                    # Check if the job link is not in the set to avoid duplicates
-                    if job_link not in self.processed_job_links:
-                        self.processed_job_links.add(job_link)
+        try:
+            for page in range(start_page, num_pages):
+                if cancel_event is not None and cancel_event.is_set():
+                    print("Scraping cancelled.")
+                    cancelled = True
+                    break
 
-                        # Save job data to the database
-                        if job_data["Date"] is not None:
-                            self.job_data_list.append(job_data)
-                            dbURL = f"https://{self.locale}.indeed.com/jobs?q={designation}"
-                            self.save_to_database(job_data, dbURL, job_type)
+                inserted_before = self.writer.total_inserted
+                new_jobs, card_count = self.scrape_page(designation, location, page, job_type, locale, switched_by)
+                if progress_callback is not None:
+                    progress_callback({
+                        "page": page + 1,
+                        "cards": card_count,
+                        "saved": self.writer.total_inserted - inserted_before,
+                    })
+                page_dates = [job_data.date for job_data in new_jobs]
+                if page == 0:
+                    top_keys = list(self.last_page_keys)
+                    top_date = max(page_dates, default=None)
+
+                # The page is flushed, a restart can skip it from here on
+                query_job_keys.extend(self.job_key(job_data.job_link) for job_data in new_jobs)
+                self.checkpoints.update(watermark_key, page, query_job_keys, self.writer.pending, top_keys, top_date,
+                                       run_id)
+                yield from new_jobs
+
+                # Results are sorted by date, so a page with nothing new means the rest is stale too
+                if incremental and card_count > 0 and not new_jobs:
+                    print("Reached already known jobs, stopping.")
+                    break
+                known_count = card_count - len(new_jobs)
+                if incremental and crossed_watermark(watermark, self.last_page_keys, page_dates, known_count):
+                    print("Crossed the previous crawl's high-water mark, stopping.")
+                    break
 
                 # Break the loop if the number of job cards is less than 15
-                if len(job_cards) < 15:
+                if card_count < 15:
                     break
 
+            # Only move the mark after a run that got through without errors
+            if top_keys and not cancelled:
+                dates = [date for date in (top_date, watermark and watermark["date"]) if date]
+                self.watermarks.update(watermark_key, max(dates, default=None), top_keys)
+            completed = not cancelled
+
         except Exception as e:
             print(f"Error: {e}")
             traceback.print_exc()
 
         finally:
+            self.flush_writes()
+            self.completed = completed
+            if completed:
+                self.checkpoints.clear(watermark_key)
             print("Scraping complete.")
-            self.driver.quit()
+            self.release_driver()
+
+    def flush_writes(self):
+        # Only remember jobs once their rows are committed
+        if self.writer.flush() is None:
+            self.seen_index.discard_pending()
+        else:
+            self.seen_index.save()
+
+        if self.output_sink is not None and self.pending_output:
+            self.output_sink.write(self.pending_output)
+        self.pending_output = []
+
+    def close(self):
+        self.flush_writes()
+        self.release_driver()
+        self.storage.close()
 
     def select_job_type(self, choice = "Fulltime"):
        
@@ -189,59 +495,23 @@ class IndeedJobScraper:
     
     def save_to_json(self, output_file_path="job_data.json"):
         with open(output_file_path, "w", encoding="utf-8") as json_file:
-            json.dump(self.job_data_list, json_file, ensure_ascii=False, indent=2)
+            json.dump([job_data.to_dict() for job_data in self.job_data_list], json_file, ensure_ascii=False, indent=2)
         print(f"Data saved to {output_file_path}.")
 
-    def save_to_database(self, job_data, url, job_type):
-        try:
-            cursor = self.conn.cursor()
-            # Check if the job link already exists in the 'indeed_jobs' table
-            cursor.execute("SELECT id FROM indeed_jobs WHERE title = %s AND company = %s AND date_of_post = %s", (job_data["Title"], job_data["Company"], job_data["Date"]))
-            existing_job_id = cursor.fetchone()
-            if(job_data['Title']):
-                if not existing_job_id:
-                    # Job link does not exist, insert the new job data
-                    cursor.execute("""
-                        INSERT INTO indeed_jobs (title, company, job_link, location, date_of_post, title_search, location_search, search_query, job_type)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (job_data["Title"], job_data["Company"], job_data["Job Link"], job_data["Location"], job_data["Date"], self.title, self.location, url, job_type))
-
-                    self.conn.commit()
-                    print(f"Job data saved to the database.")
-            else:
-                print(f"Job with link '{job_data['Job Link']}' already exists in the database.")
-
-        except mysql.connector.Error as e:
-            print(f"Error: {e}")
-
-def convert_date(date_str):
-    # English date strings
-    if "Just posted" in date_str or "Today" in date_str or "Active" in date_str:
-        return datetime.today().strftime("%Y-%m-%d")
-    elif "day ago" in date_str:
-        days_ago = int(date_str.split()[1])
-        return (datetime.today() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-    elif "days ago" in date_str:
-        days_ago = int(date_str.split()[0])
-        return (datetime.today() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-    
-    # German date strings
-    elif "Heute" in date_str or "Gerade geschaltet" in date_str or "Aktiv" in date_str:
-        return datetime.today().strftime("%Y-%m-%d")
-    elif "Vor" in date_str:
-        days_ago = int(date_str.split("Vor ")[1].split(" ")[0])
-        return (datetime.today() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-    
-    # Dutch date strings
-    elif "Zojuist geplaatst" in date_str or "Vandaag" in date_str or "Actief" in date_str:
-        return datetime.today().strftime("%Y-%m-%d")
-    elif "dagen geleden" in date_str:
-        days_ago = int(date_str.split()[0])
-        return (datetime.today() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-    elif "dag geleden" in date_str:
-        return (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")
-    
-    return None
+    def save_to_database(self, job_data, url, job_type, title_search=None, location_search=None):
+        # Buffered, rows are written in batches by self.writer.flush()
+        if title_search is None:
+            title_search, location_search = self.title, self.location
+        self.writer.add(job_data, title_search, location_search, url, job_type)
+        jk = job_key_from_link(job_data.job_link)
+        if jk is not None:
+            self.seen_index.add(jk)
+        if self.output_sink is not None:
+            self.pending_output.append(job_data)
+
+def convert_date(date_str, locale=None):
+    # Kept for callers of the old helper, see indeed_dates for the rules
+    return PostDateParser().parse(date_str, locale)
 
 def load_config(file_path):
     abs_file_path = os.path.abspath(file_path)
@@ -263,7 +533,23 @@ if __name__ == "__main__":
 
     # args = parser.parse_args()
 
-    scraper = IndeedJobScraper()
+    config = load_config("config.json")
+    print(config)
+
+    # e.g. "metrics_trace": "scrape_trace.jsonl", "metrics_port": 9108, "metrics_dump": "scrape_metrics.prom"
+    METRICS.configure(config.get('metrics_trace'), config.get('metrics_port'))
+
+    # Jobs are appended to job_data/ after every page, merge the shards with indeed_jsonl_sink.py
+    output_sink = JsonlJobSink(config.get('output_dir', 'job_data'), compress=config.get('output_gzip', False))
+
+    # e.g. "fetch_backends": {"nl": "http"}, "http_base_url": "http://127.0.0.1:8765" for recorded pages
+    scraper = IndeedJobScraper(
+        fetch_backends=config.get('fetch_backends'),
+        http_fetcher=HttpFetcher(base_url=config.get('http_base_url')),
+        output_sink=output_sink
+    )
+    # e.g. "checkpoint_max_age_hours": 2, "run_id": "2026-10-18" from a daily cron job
+    scraper.checkpoints = CrawlCheckpointStore(max_age_hours=config.get('checkpoint_max_age_hours', 6))
 
     # job_type = args.job_type
     # for i in range(1, 5):
@@ -271,10 +557,14 @@ if __name__ == "__main__":
     
     # if(args.job_type == 0):
     #     job_type = input("Please Select any Job Type: ")
-    
-    config = load_config("config.json")
-    print(config)
 
-    scraper.scrape_jobs(config['title'], config['location'], int(config['pages']), config['job_type'], config['locale']
+    jobs = scraper.iter_jobs(config['title'], config['location'], int(config['pages']), config['job_type'], config['locale'],
+        incremental=config.get('incremental', False), resume=config.get('resume', True), run_id=config.get('run_id')
     )
-    scraper.save_to_json()  
+    saved = sum(1 for _ in jobs)
+    scraper.close()
+    output_sink.close()
+    if config.get('metrics_dump'):
+        METRICS.dump(config['metrics_dump'])
+    METRICS.close()
+    print(f"{saved} jobs appended to {config.get('output_dir', 'job_data')}.")
@@ -0,0 +1,77 @@
+import hashlib
+import time
+from urllib.parse import parse_qs, urlparse
+from indeed_metrics import METRICS
+
+def natural_job_key(title, company, date_of_post):
+    # Same identity the old SELECT-before-INSERT check used; matches
+    # SHA1(CONCAT_WS('|', title, company, date_of_post)) on the MySQL side
+    parts = [str(value) for value in (title, company, date_of_post) if value is not None]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+def job_key_from_link(job_link):
+    # Indeed's job id, the jk= query parameter of the job link
+    if not job_link:
+        return None
+    values = parse_qs(urlparse(job_link).query).get("jk")
+    return values[0] if values else None
+
+def row_job_key(jk, title, company, date_of_post):
+    # The unique job_key of a row: derived from Indeed's jk when the card has one, postings
+    # that share a title, company and day are still distinct jobs. Cards without a link fall
+    # back to the natural key.
+    if jk:
+        return hashlib.sha1(f"jk|{jk}".encode("utf-8")).hexdigest()
+    return natural_job_key(title, company, date_of_post)
+
+class IndeedJobWriter:
+    def __init__(self, storage, batch_size=50):
+        # Any backend from indeed_storage, rows are handed over in JOB_COLUMNS order
+        self.storage = storage
+        self.batch_size = batch_size
+        self.pending = []
+        self.total_inserted = 0
+        self.total_skipped = 0
+
+    def add(self, job_data, title_search, location_search, search_query, job_type):
+        # job_data is a JobRecord
+        if not job_data.title:
+            return
+
+        jk = job_key_from_link(job_data.job_link)
+        self.pending.append((
+            row_job_key(jk, job_data.title, job_data.company, job_data.date),
+            jk,
+            job_data.title, job_data.company, job_data.job_link, job_data.location, job_data.date,
+            title_search, location_search, search_query, job_type,
+        ))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return 0, 0
+
+        rows, self.pending = self.pending, []
+        backend = self.storage.name
+        start = time.perf_counter()
+        try:
+            # One transaction per flush, rolled back as a whole on error
+            inserted = self.storage.insert_jobs(rows)
+        except self.storage.Error as e:
+            print(f"Error: {e}")
+            METRICS.inc("indeed_db_errors_total", backend=backend)
+            METRICS.trace("flush", backend=backend, rows=len(rows), error=str(e))
+            # Kept for the next flush, and for crawl checkpoints if the process dies first
+            self.pending = rows + self.pending
+            return None
+
+        skipped = len(rows) - inserted
+        self.total_inserted += inserted
+        self.total_skipped += skipped
+        METRICS.inc("indeed_rows_inserted_total", inserted, backend=backend)
+        METRICS.inc("indeed_rows_skipped_total", skipped, backend=backend)
+        METRICS.trace("flush", backend=backend, rows=len(rows), inserted=inserted, skipped=skipped,
+                      write_seconds=round(time.perf_counter() - start, 4))
+        print(f"Job data saved to the database: {inserted} inserted, {skipped} skipped.")
+        return inserted, skipped
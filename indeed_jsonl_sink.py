@@ -0,0 +1,137 @@
+import argparse
+import datetime
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+
+from indeed_job_writer import job_key_from_link, natural_job_key
+
+class JsonlJobSink:
+    # Append-only JSON lines output, one shard at a time. Every write() is flushed,
+    # so a crashed run keeps everything up to its last completed page.
+    def __init__(self, directory="job_data", prefix="jobs", compress=False, max_bytes=64 * 1024 * 1024, max_seconds=3600):
+        self.directory = directory
+        self.prefix = prefix
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.lock = threading.Lock()
+        self.raw = None
+        self.file = None
+        self.path = None
+        self.opened = None
+        self.shard = 0
+        self.total_written = 0
+
+    def open_shard(self):
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        self.shard += 1
+        # Names sort in write order, the pid keeps concurrent processes apart
+        name = f"{self.prefix}-{timestamp}-{os.getpid()}-{self.shard:04d}.jsonl"
+        self.path = os.path.join(self.directory, name + (".gz" if self.compress else ""))
+        self.raw = open(self.path, "ab")
+        self.file = gzip.GzipFile(fileobj=self.raw, mode="ab") if self.compress else self.raw
+        self.opened = time.monotonic()
+
+    def should_rotate(self):
+        if self.file is None:
+            return False
+        too_big = self.max_bytes and self.raw.tell() >= self.max_bytes
+        too_old = self.max_seconds and time.monotonic() - self.opened >= self.max_seconds
+        return bool(too_big or too_old)
+
+    def write(self, records):
+        # records are JobRecords or legacy dicts
+        if not records:
+            return 0
+        lines = "".join(
+            json.dumps(record if isinstance(record, dict) else record.to_dict(), ensure_ascii=False) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+        with self.lock:
+            if self.should_rotate():
+                self.close_shard()
+            if self.file is None:
+                self.open_shard()
+            self.file.write(lines)
+            # Sync-flushes the gzip stream too, everything written so far can be read back
+            self.file.flush()
+            self.total_written += len(records)
+        return len(records)
+
+    def close_shard(self):
+        if self.file is not None:
+            self.file.close()
+            if self.file is not self.raw:
+                self.raw.close()
+        self.raw = None
+        self.file = None
+
+    def close(self):
+        with self.lock:
+            self.close_shard()
+
+def shard_paths(directory, prefix="jobs"):
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}-*.jsonl")) +
+                  glob.glob(os.path.join(directory, f"{prefix}-*.jsonl.gz")))
+
+def iter_shard_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rb") as shard:
+            for line in shard:
+                # A line without its newline is the tail of an interrupted write
+                if line.endswith(b"\n"):
+                    yield line
+    except (EOFError, gzip.BadGzipFile, zlib.error):
+        # Shard of a run that never closed its gzip stream, keep what was flushed
+        pass
+
+def record_key(job_data):
+    return job_key_from_link(job_data.get("Job Link")) or natural_job_key(
+        job_data.get("Title"), job_data.get("Company"), job_data.get("Date"))
+
+def read_jobs(paths, dedupe=True):
+    # Streams job dicts from the shards in order, the first copy of each job wins
+    seen_keys = set()
+    for path in paths:
+        for line in iter_shard_lines(path):
+            job_data = json.loads(line)
+            if dedupe:
+                key = record_key(job_data)
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+            yield job_data
+
+def merge_shards(paths, output_path):
+    opener = gzip.open if output_path.endswith(".gz") else open
+    merged = 0
+    with opener(output_path, "wt", encoding="utf-8") as output_file:
+        for job_data in read_jobs(paths):
+            output_file.write(json.dumps(job_data, ensure_ascii=False) + "\n")
+            merged += 1
+    return merged
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read and merge JSONL job shards")
+    parser.add_argument("directory", help="Directory the scraper wrote its shards to")
+    parser.add_argument("--prefix", default="jobs", help="Shard file name prefix")
+    parser.add_argument("--output", help="Merged, deduplicated JSONL file (.gz to compress), counts only when omitted")
+
+    args = parser.parse_args()
+
+    paths = shard_paths(args.directory, args.prefix)
+    start = time.perf_counter()
+    if args.output:
+        count = merge_shards(paths, args.output)
+        print(f"Merged {len(paths)} shards into {args.output}: {count} jobs in {time.perf_counter() - start:.2f}s")
+    else:
+        count = sum(1 for _ in read_jobs(paths))
+        print(f"{len(paths)} shards, {count} unique jobs, read in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, from a fast SQLite commit up to a stalled WebDriverWait
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def format_labels(key, extra=None):
+    pairs = list(key) + list(extra or [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds, count=1):
+        self.count += count
+        self.total += seconds
+        # Batched observations (count > 1) land in the bucket of their average
+        average = seconds / count if count else seconds
+        for index, bound in enumerate(BUCKETS):
+            if average <= bound:
+                self.buckets[index] += count
+                break
+
+class Metrics:
+    # Process-wide counters and timers, exported as Prometheus text, plus an optional JSON-lines trace
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.gauges = {}
+        self.histograms = defaultdict(Histogram)
+        self.trace_file = None
+        self.server = None
+
+    def configure(self, trace_path=None, port=None):
+        if trace_path:
+            self.trace_file = open(trace_path, "a", encoding="utf-8")
+        if port:
+            self.serve(port)
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[(name, label_key(labels))] += value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[(name, label_key(labels))] = value
+
+    def observe(self, name, seconds, count=1, **labels):
+        with self.lock:
+            self.histograms[(name, label_key(labels))].observe(seconds, count)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def trace(self, event, **fields):
+        if self.trace_file is None:
+            return
+        line = json.dumps(dict(ts=round(time.time(), 3), event=event, **fields), ensure_ascii=False, default=str)
+        with self.lock:
+            self.trace_file.write(line + "\n")
+            # Readable while the run is still going
+            self.trace_file.flush()
+
+    def prometheus_text(self):
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted(self.histograms.items())
+            typed = set()
+            for (name, key), value in counters:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{format_labels(key)} {value:g}")
+            for (name, key), value in gauges:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{format_labels(key)} {value:g}")
+            for (name, key), histogram in histograms:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{format_labels(key, [('le', f'{bound:g}')])} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(key, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{name}_sum{format_labels(key)} {histogram.total:.6f}")
+                lines.append(f"{name}_count{format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def serve(self, port=9108):
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+
+METRICS = Metrics()
+
+def summarize_trace(path):
+    # Per event and field: how many, median, p90 and max of every *_seconds value
+    samples = defaultdict(list)
+    with open(path, "r", encoding="utf-8") as trace_file:
+        for line in trace_file:
+            record = json.loads(line)
+            for field, value in record.items():
+                if field.endswith("seconds") and isinstance(value, (int, float)):
+                    samples[(record["event"], field)].append(value)
+
+    for (event, field), values in sorted(samples.items()):
+        values.sort()
+        p50 = values[len(values) // 2]
+        p90 = values[min(len(values) - 1, int(len(values) * 0.9))]
+        print(f"{event:<12} {field:<20} n={len(values):<6} p50={p50:.3f}s p90={p90:.3f}s max={values[-1]:.3f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a JSON-lines trace written by a scrape run")
+    parser.add_argument("trace", help="Trace file, as set by metrics_trace in config.json")
+
+    args = parser.parse_args()
+    summarize_trace(args.trace)
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from indeed_browser_pool import BrowserSessionPool
+from indeed_fetchers import HttpFetcher
+from indeed_job_scraper import IndeedJobScraper
+from indeed_rate_control import RateController
+from indeed_watermarks import CrawlWatermarkStore
+
+QUERY_DEFAULTS = {
+    "location": "",
+    "locale": "de",
+    "job_type": "Fulltime",
+    "switched_by": "All",
+    "pages": 5,
+    "interval_minutes": 360,
+    "priority": 0,
+}
+
+def load_manifest(path):
+    # Either a list of queries or {"defaults": {...}, "queries": [...]}
+    with open(path, "r", encoding="utf-8") as json_file:
+        manifest = json.load(json_file)
+    if isinstance(manifest, list):
+        manifest = {"queries": manifest}
+    defaults = dict(QUERY_DEFAULTS, **manifest.get("defaults", {}))
+    return [dict(defaults, **query) for query in manifest["queries"]]
+
+def query_key(query):
+    return CrawlWatermarkStore.query_key(query["title"], query["location"], query["locale"],
+                                         query["job_type"], query["switched_by"])
+
+def location_parts(location):
+    return [part.strip().lower() for part in (location or "").split(",") if part.strip()]
+
+def covers(broad, narrow):
+    # "" covers every location, "Noord-Holland" covers "Amsterdam, Noord-Holland"
+    broad_parts = location_parts(broad)
+    narrow_parts = location_parts(narrow)
+    return len(broad_parts) <= len(narrow_parts) and narrow_parts[len(narrow_parts) - len(broad_parts):] == broad_parts
+
+def dedupe_queries(queries):
+    # The same search in a nested location only re-reads the broader query's results.
+    # The broader query keeps the most pages, the shortest interval and the highest priority.
+    groups = defaultdict(list)
+    for query in queries:
+        search = tuple(str(query[field]).strip().lower() for field in ("title", "locale", "job_type", "switched_by"))
+        groups[search].append(dict(query))
+
+    kept = []
+    dropped = []
+    for group in groups.values():
+        # Broadest locations first
+        group.sort(key=lambda query: len(location_parts(query["location"])))
+        survivors = []
+        for query in group:
+            parent = next((survivor for survivor in survivors if covers(survivor["location"], query["location"])), None)
+            if parent is None:
+                survivors.append(query)
+                continue
+            parent["pages"] = max(parent["pages"], query["pages"])
+            parent["interval_minutes"] = min(parent["interval_minutes"], query["interval_minutes"])
+            parent["priority"] = max(parent["priority"], query["priority"])
+            dropped.append((query, parent))
+        kept.extend(survivors)
+    return kept, dropped
+
+class RateBudget:
+    # Global token bucket shared by every worker, one token per result page
+    def __init__(self, pages_per_minute=30, burst=5):
+        self.rate = pages_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, locale=None):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+class ScheduleState:
+    # When each query last finished, so a restart does not re-run everything at once
+    def __init__(self, path="orchestrator_state.json"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.last_run = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as json_file:
+                self.last_run = json.load(json_file)
+
+    def next_due(self, query):
+        last_run = self.last_run.get(query_key(query))
+        return 0 if last_run is None else last_run + query["interval_minutes"] * 60
+
+    def finished(self, query):
+        with self.lock:
+            self.last_run[query_key(query)] = time.time()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as json_file:
+                json.dump(self.last_run, json_file, indent=2)
+            os.replace(tmp_path, self.path)
+
+class CrawlOrchestrator:
+    def __init__(self, queries, workers=3, pages_per_minute=30, burst=5, locale_caps=None, default_locale_cap=1,
+                 state_path="orchestrator_state.json", fetch_backends=None, scraper_factory=IndeedJobScraper,
+                 checkpoint_max_age_hours=6, retry_minutes=10):
+        self.queries, dropped = dedupe_queries(queries)
+        for query, parent in dropped:
+            print(f"Skipping '{query['title']}' in '{query['location']}', covered by '{parent['location'] or 'all locations'}'.")
+
+        self.workers = workers
+        self.budget = RateBudget(pages_per_minute, burst)
+        self.rate_controller = RateController()
+        self.locale_caps = dict(locale_caps or {})
+        self.default_locale_cap = default_locale_cap
+        self.state = ScheduleState(state_path)
+        self.fetch_backends = fetch_backends
+        self.scraper_factory = scraper_factory
+        self.checkpoint_max_age_hours = checkpoint_max_age_hours
+        # A failed or interrupted query stays due, it is retried after this delay and resumes
+        self.retry_minutes = retry_minutes
+        self.retry_at = {}
+
+        # Warm browsers, one HTTP pool and one watermark store shared by all workers
+        self.browser_pool = BrowserSessionPool(max_size=workers)
+        self.http_fetcher = HttpFetcher(max_connections=workers)
+        self.watermarks = CrawlWatermarkStore()
+        self.local = threading.local()
+        self.scrapers = []
+
+        self.lock = threading.Condition()
+        self.running = set()
+        self.running_per_locale = defaultdict(int)
+        self.stop_event = threading.Event()
+
+    def locale_cap(self, locale):
+        return self.locale_caps.get(locale, self.default_locale_cap)
+
+    def scraper(self):
+        # One long-lived scraper per worker thread
+        scraper = getattr(self.local, "scraper", None)
+        if scraper is None:
+            scraper = self.scraper_factory(browser_pool=self.browser_pool, fetch_backends=self.fetch_backends,
+                                           http_fetcher=self.http_fetcher)
+            scraper.watermarks = self.watermarks
+            scraper.page_gate = self.budget.acquire
+            scraper.rate_controller = self.rate_controller
+            scraper.checkpoints.max_age_hours = self.checkpoint_max_age_hours
+            self.local.scraper = scraper
+            with self.lock:
+                self.scrapers.append(scraper)
+        return scraper
+
+    def run_query(self, query):
+        key = query_key(query)
+        failed = True
+        try:
+            scraper = self.scraper()
+            start = time.monotonic()
+            # The slot this run was due in, a retry of an unfinished run resumes, the next slot starts fresh
+            run_id = str(int(self.state.next_due(query)))
+            jobs = scraper.iter_jobs(query["title"], query["location"], int(query["pages"]), query["job_type"],
+                                     query["locale"], query["switched_by"], incremental=True, resume=True,
+                                     cancel_event=self.stop_event, run_id=run_id)
+            found = sum(1 for _ in jobs)
+            if scraper.completed and not self.stop_event.is_set():
+                print(f"Finished '{query['title']}' in '{query['location'] or query['locale']}': {found} new jobs "
+                      f"in {time.monotonic() - start:.0f}s")
+                self.state.finished(query)
+                failed = False
+        except Exception as e:
+            print(f"Error: {e}")
+            traceback.print_exc()
+        finally:
+            with self.lock:
+                if failed and not self.stop_event.is_set():
+                    print(f"'{query['title']}' in '{query['location'] or query['locale']}' did not finish, "
+                          f"retrying in {self.retry_minutes} minutes.")
+                    self.retry_at[key] = time.time() + self.retry_minutes * 60
+                self.running.discard(key)
+                self.running_per_locale[query["locale"]] -= 1
+                self.lock.notify_all()
+
+    def next_query(self, now):
+        # Highest priority first, then the most overdue; skips locales at their cap
+        due = [query for query in self.queries
+               if self.state.next_due(query) <= now and query_key(query) not in self.running
+               and self.retry_at.get(query_key(query), 0) <= now]
+        due.sort(key=lambda query: (-query["priority"], self.state.next_due(query)))
+        for query in due:
+            if self.running_per_locale[query["locale"]] < self.locale_cap(query["locale"]):
+                return query
+        return None
+
+    def run(self, once=False, poll_interval=5):
+        started = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while not self.stop_event.is_set():
+                    with self.lock:
+                        query = None
+                        if len(self.running) < self.workers:
+                            query = self.next_query(time.time())
+                            if once and query is not None and query_key(query) in started:
+                                query = None
+                        if query is not None:
+                            self.running.add(query_key(query))
+                            self.running_per_locale[query["locale"]] += 1
+                            started.add(query_key(query))
+                        elif once and not self.running and \
+                                all(query_key(query) in started or self.state.next_due(query) > time.time()
+                                    for query in self.queries):
+                            break
+                        else:
+                            self.lock.wait(poll_interval)
+                            continue
+                    executor.submit(self.run_query, query)
+            except KeyboardInterrupt:
+                print("Stopping, waiting for running queries to reach a page boundary.")
+                self.stop_event.set()
+        self.close()
+
+    def close(self):
+        with self.lock:
+            scrapers, self.scrapers = self.scrapers, []
+        for scraper in scrapers:
+            scraper.close()
+        self.browser_pool.close()
+        self.http_fetcher.close()
+
+def parse_caps(values):
+    caps = {}
+    for value in values or []:
+        locale, cap = value.split("=", 1)
+        caps[locale.strip()] = int(cap)
+    return caps
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a manifest of Indeed queries on a schedule")
+    parser.add_argument("manifest", help="JSON list of queries, each with title, location, locale, job_type, "
+                                         "switched_by, pages, interval_minutes and priority")
+    parser.add_argument("--workers", type=int, default=3, help="Concurrent queries, each with a warm browser")
+    parser.add_argument("--pages-per-minute", type=float, default=30, help="Global page budget across all workers")
+    parser.add_argument("--burst", type=int, default=5, help="Pages that may start back to back")
+    parser.add_argument("--locale-cap", action="append", help="Concurrent queries per locale, e.g. de=2 (repeatable)")
+    parser.add_argument("--default-locale-cap", type=int, default=1, help="Cap for locales without --locale-cap")
+    parser.add_argument("--state", default="orchestrator_state.json", help="Where last run times are kept")
+    parser.add_argument("--once", action="store_true", help="Run every due query once and exit")
+    parser.add_argument("--checkpoint-max-age", type=float, default=6,
+                        help="Hours an interrupted query may be resumed from its last page, older runs start over")
+    parser.add_argument("--retry-minutes", type=float, default=10, help="Delay before a query that failed mid-crawl is retried")
+
+    args = parser.parse_args()
+
+    orchestrator = CrawlOrchestrator(load_manifest(args.manifest), args.workers, args.pages_per_minute, args.burst,
+                                     parse_caps(args.locale_cap), args.default_locale_cap, args.state,
+                                     checkpoint_max_age_hours=args.checkpoint_max_age, retry_minutes=args.retry_minutes)
+    orchestrator.run(once=args.once)
@@ -0,0 +1,80 @@
+import time
+from collections import defaultdict, deque
+
+# One round trip per poll: document state, rendered job cards and the number of
+# network resources the page has requested so far
+READINESS_SCRIPT = """
+return [
+    document.readyState,
+    document.querySelectorAll('div.job_seen_beacon').length,
+    window.performance && performance.getEntriesByType
+        ? performance.getEntriesByType('resource').length
+        : 0
+];
+"""
+
+class PageReadinessWaiter:
+    def __init__(self, min_timeout=3, max_timeout=15, headroom=2.0, history_size=20,
+                 poll_interval=0.25, stable_polls=2, idle_window=1.0):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom
+        self.poll_interval = poll_interval
+        self.stable_polls = stable_polls
+        self.idle_window = idle_window
+        # Recent load times per locale, used to size the next timeout
+        self.load_times = defaultdict(lambda: deque(maxlen=history_size))
+
+    def timeout_for(self, locale):
+        history = self.load_times[locale]
+        if not history:
+            return self.max_timeout
+
+        ordered = sorted(history)
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        return min(self.max_timeout, max(self.min_timeout, p90 * self.headroom))
+
+    def wait_for_page(self, driver, locale):
+        timeout = self.timeout_for(locale)
+        start = time.monotonic()
+        deadline = start + timeout
+
+        last_count = -1
+        stable = 0
+        last_resources = -1
+        idle_since = start
+        reason = "timeout"
+
+        while True:
+            now = time.monotonic()
+            try:
+                ready_state, card_count, resources = driver.execute_script(READINESS_SCRIPT)
+            except Exception:
+                # The page may still be navigating; retry on the next poll
+                ready_state, card_count, resources = "loading", 0, last_resources
+
+            if card_count > 0 and card_count == last_count:
+                stable += 1
+            else:
+                stable = 0
+            last_count = card_count
+
+            if resources != last_resources:
+                last_resources = resources
+                idle_since = now
+
+            if card_count > 0 and stable >= self.stable_polls and ready_state != "loading":
+                reason = "cards"
+                break
+            if ready_state == "complete" and now - idle_since >= self.idle_window:
+                # Nothing left in flight; an empty results page is also ready
+                reason = "network-idle"
+                break
+            if now >= deadline:
+                break
+
+            time.sleep(self.poll_interval)
+
+        waited = time.monotonic() - start
+        self.load_times[locale].append(waited)
+        return waited, reason
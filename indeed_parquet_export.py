@@ -0,0 +1,166 @@
+import datetime
+import json
+import os
+import uuid
+from collections import OrderedDict
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SNAPSHOT_FIELDS = ["id", "title", "company", "job_link", "location", "date_of_post", "search_query", "job_type", "created_on"]
+# Partition directories are named dt=YYYY-MM-DD so they do not clash with the date_of_post column
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+def snapshot_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        # Few distinct companies and locations, dictionary encoding keeps them small
+        ("company", pa.dictionary(pa.int32(), pa.string())),
+        ("job_link", pa.string()),
+        ("location", pa.dictionary(pa.int32(), pa.string())),
+        ("date_of_post", pa.date32()),
+        ("search_query", pa.string()),
+        ("job_type", pa.dictionary(pa.int8(), pa.string())),
+        ("created_on", pa.timestamp("s")),
+    ])
+
+def as_date(value):
+    if value is None or isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+def as_timestamp(value):
+    # SQLite hands timestamps back as text
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+class IndeedSnapshotExporter:
+    def __init__(self, manager, output_dir="snapshots", compression="zstd", max_open_writers=32):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet/Arrow snapshots: pip install pyarrow")
+        self.manager = manager
+        self.output_dir = output_dir
+        self.compression = compression
+        # Wide date ranges would otherwise keep a file open per day
+        self.max_open_writers = max_open_writers
+        self.state_path = os.path.join(output_dir, "_snapshot_state.json")
+        self.schema = snapshot_schema()
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def save_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as json_file:
+            json.dump(state, json_file, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def open_writer(self, partition, output_format, part_name):
+        # Written under a dot-prefixed temp name that dataset readers skip, renamed once the export succeeds.
+        # Returns the writer, its temp path and its final path.
+        partition_dir = os.path.join(self.output_dir, f"dt={partition}")
+        os.makedirs(partition_dir, exist_ok=True)
+        path = os.path.join(partition_dir, f"{part_name}.{output_format}")
+        tmp_path = os.path.join(partition_dir, f".{part_name}.{output_format}.tmp")
+        if output_format == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            return pa.ipc.new_file(tmp_path, self.schema, options=options), tmp_path, path
+        return pq.ParquetWriter(tmp_path, self.schema, compression=self.compression), tmp_path, path
+
+    def record_batch(self, rows):
+        columns = list(zip(*rows))
+        data = dict(zip(SNAPSHOT_FIELDS, columns))
+        data["date_of_post"] = [as_date(value) for value in data["date_of_post"]]
+        data["created_on"] = [as_timestamp(value) for value in data["created_on"]]
+        return pa.RecordBatch.from_arrays(
+            [pa.array(data[field.name], type=field.type) for field in self.schema],
+            schema=self.schema,
+        )
+
+    def export(self, location=None, title=None, search_mode="contains", output_format="parquet",
+               incremental=False, chunk_size=50000):
+        state = self.load_state()
+        state_key = f"{output_format}|{location or ''}|{title or ''}|{search_mode}"
+        # Incremental snapshots only pick up rows added since the last one
+        after_id = state.get(state_key) if incremental else None
+
+        # Unique per export, two exports in the same second must not share part files
+        run_name = f"part-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        # Open writers by partition, least recently used first
+        writers = OrderedDict()
+        parts = []
+        partitions_written = set()
+        exported = 0
+        last_id = after_id
+        succeeded = False
+
+        try:
+            for rows in self.manager.iter_rows(location, title, search_mode, after_id=after_id,
+                                               chunk_size=chunk_size, fields=SNAPSHOT_FIELDS):
+                partitions = {}
+                for row in rows:
+                    date = as_date(row[5])
+                    partitions.setdefault(date.isoformat() if date else NULL_PARTITION, []).append(row)
+
+                for partition, partition_rows in partitions.items():
+                    writer = writers.pop(partition, None)
+                    if writer is None:
+                        if len(writers) >= self.max_open_writers:
+                            # A partition seen again later gets another part file
+                            _, oldest = writers.popitem(last=False)
+                            oldest.close()
+                        writer, tmp_path, path = self.open_writer(partition, output_format, f"{run_name}-{len(parts)}")
+                        parts.append((tmp_path, path))
+                        partitions_written.add(partition)
+                    writers[partition] = writer
+                    batch = self.record_batch(partition_rows)
+                    if output_format == "arrow":
+                        writer.write_batch(batch)
+                    else:
+                        writer.write_table(pa.Table.from_batches([batch]))
+
+                exported += len(rows)
+                last_id = rows[-1][0]
+
+            for writer in writers.values():
+                writer.close()
+            writers.clear()
+            succeeded = True
+        finally:
+            if not succeeded:
+                # Nothing of a failed export is left behind, the next run starts from the same id
+                for writer in writers.values():
+                    try:
+                        writer.close()
+                    except Exception:
+                        pass
+                for tmp_path, _ in parts:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+        if not exported:
+            print("No new data found for snapshot.")
+            return 0
+
+        for tmp_path, path in parts:
+            os.replace(tmp_path, path)
+        state[state_key] = last_id
+        self.save_state(state)
+        print(f"Snapshot written to {self.output_dir}: {exported} rows in {len(partitions_written)} partitions, "
+              f"{len(parts)} files, last id {last_id}")
+        return exported
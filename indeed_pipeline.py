@@ -0,0 +1,203 @@
+import argparse
+import json
+import queue
+import threading
+import time
+import traceback
+
+from indeed_html_parser import parse_job_cards
+from indeed_job_scraper import BULK_EXTRACT_SCRIPT, IndeedJobScraper
+from indeed_jsonl_sink import JsonlJobSink
+from indeed_metrics import METRICS
+from indeed_rate_control import PageBlockedError, is_block_page
+
+class StageStats:
+    def __init__(self, name, output_queue=None):
+        self.name = name
+        self.output_queue = output_queue
+        self.items = 0
+        self.busy = 0.0
+        self.started = time.monotonic()
+        self.max_depth = 0
+        self.lock = threading.Lock()
+
+    def record(self, items, busy):
+        with self.lock:
+            self.items += items
+            self.busy += busy
+            depth = self.output_queue.qsize() if self.output_queue is not None else 0
+            self.max_depth = max(self.max_depth, depth)
+        # Live on the metrics endpoint while the run is going
+        METRICS.inc("indeed_pipeline_items_total", items, stage=self.name)
+        METRICS.inc("indeed_pipeline_busy_seconds_total", busy, stage=self.name)
+        if self.output_queue is not None:
+            METRICS.set("indeed_pipeline_queue_depth", depth, stage=self.name)
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            return {
+                "stage": self.name,
+                "items": self.items,
+                "per_second": self.items / elapsed,
+                "busy_ratio": self.busy / elapsed,
+                "queue_depth": self.output_queue.qsize() if self.output_queue is not None else 0,
+                "max_queue_depth": self.max_depth,
+            }
+
+class IndeedPipeline:
+    # fetch pages -> parse cards -> write rows, each stage on its own thread and
+    # linked by bounded queues, so a full queue slows the stage in front of it
+    def __init__(self, scraper=None, queue_size=4, extraction="script"):
+        self.scraper = scraper or IndeedJobScraper()
+        self.extraction = extraction
+        self.pages = queue.Queue(maxsize=queue_size)
+        self.rows = queue.Queue(maxsize=queue_size * 15)
+        self.fetch_stats = StageStats("fetch", self.pages)
+        self.parse_stats = StageStats("parse", self.rows)
+        self.write_stats = StageStats("write")
+        # Records are not kept here, the storage and the scraper's output_sink hold them
+        self.saved = 0
+
+    def load_page(self, url, locale):
+        # One attempt at a page, returns (records, card_count) for scraper.with_page_retries.
+        # HTML is parsed here, the card count decides retries and where the query ends.
+        scraper = self.scraper
+        if scraper.page_gate is not None:
+            scraper.page_gate(locale)
+        if scraper.backend_for(locale) == "http":
+            kind, payload = "html", scraper.ensure_http_fetcher().fetch(url)
+        else:
+            driver = scraper.acquire_driver()
+            driver.get(url)
+            scraper.pages_loaded += 1
+            scraper.readiness.wait_for_page(driver, locale)
+            if self.extraction == "html":
+                kind, payload = "html", driver.page_source
+            else:
+                kind, payload = "records", driver.execute_script(BULK_EXTRACT_SCRIPT) or []
+        records = parse_job_cards(payload, f"https://{locale}.indeed.com") if kind == "html" else payload
+        if not records and is_block_page(payload if kind == "html" else scraper.driver.page_source):
+            raise PageBlockedError(url)
+        return records, len(records)
+
+    def fetch_stage(self, queries, num_pages):
+        scraper = self.scraper
+        try:
+            for query in queries:
+                locale = query.get("locale", "de")
+                job_type = scraper.select_job_type(query.get("job_type", "Fulltime"))
+
+                for page in range(num_pages):
+                    start = time.monotonic()
+                    url = scraper.search_url(query["title"], query.get("location", ""), page, job_type,
+                                             locale, query.get("switched_by", "All"))
+                    try:
+                        # Same pacing, block detection and page retries as scrape_page
+                        records, card_count = scraper.with_page_retries(locale, page,
+                                                                        lambda: self.load_page(url, locale))
+                    except Exception as e:
+                        print(f"Error: {e}")
+                        traceback.print_exc()
+                        break
+
+                    self.fetch_stats.record(1, time.monotonic() - start)
+                    self.pages.put((page, query, job_type, records))
+                    # A short page is the last one, nothing is fetched past the end of the results
+                    if card_count < 15:
+                        break
+        finally:
+            self.pages.put(None)
+
+    def parse_stage(self):
+        scraper = self.scraper
+        try:
+            while True:
+                item = self.pages.get()
+                if item is None:
+                    break
+
+                start = time.monotonic()
+                page, query, job_type, records = item
+                locale = query.get("locale", "de")
+                # No live element fallback here, the fetch stage owns the browser
+                page_jobs, card_count = scraper.records_to_jobs(records, locale=locale)
+
+                search_query = f"https://{locale}.indeed.com/jobs?q={query['title']}"
+                new_rows = []
+                for job_data in page_jobs:
+                    job_key = scraper.job_key(job_data.job_link)
+                    if job_key in scraper.processed_job_keys or job_data.date is None:
+                        continue
+                    scraper.processed_job_keys.add(job_key)
+                    new_rows.append((job_data, query["title"], query.get("location", ""), search_query, job_type))
+                self.parse_stats.record(1, time.monotonic() - start)
+
+                print(f"Page {page + 1} of '{query['title']}': {card_count} cards, {len(new_rows)} new")
+                for row in new_rows:
+                    self.rows.put(row)
+                # End of page, the writer commits once per page
+                self.rows.put("flush")
+        finally:
+            self.rows.put(None)
+
+    def write_stage(self):
+        scraper = self.scraper
+        while True:
+            item = self.rows.get()
+            if item is None:
+                break
+
+            start = time.monotonic()
+            if item == "flush":
+                scraper.flush_writes()
+                self.write_stats.record(0, time.monotonic() - start)
+                continue
+
+            job_data, title_search, location_search, search_query, job_type = item
+            scraper.save_to_database(job_data, search_query, job_type, title_search, location_search)
+            self.saved += 1
+            self.write_stats.record(1, time.monotonic() - start)
+
+        scraper.flush_writes()
+
+    def stats(self):
+        return [stats.snapshot() for stats in (self.fetch_stats, self.parse_stats, self.write_stats)]
+
+    def run(self, queries, num_pages=2):
+        threads = [
+            threading.Thread(target=self.fetch_stage, args=(queries, num_pages), daemon=True),
+            threading.Thread(target=self.parse_stage, daemon=True),
+            threading.Thread(target=self.write_stage, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.scraper.release_driver()
+        for stage in self.stats():
+            print(f"{stage['stage']}: {stage['items']} items, {stage['per_second']:.2f}/s, "
+                  f"busy {stage['busy_ratio']:.0%}, queue depth max {stage['max_queue_depth']}")
+        return self.saved
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Indeed queries through a staged fetch/parse/write pipeline")
+    parser.add_argument("queries", help="JSON file with a list of {title, location, locale, job_type, switched_by}")
+    parser.add_argument("--pages", type=int, default=2, help="Number of pages to scrape per query")
+    parser.add_argument("--queue-size", type=int, default=4, help="Pages buffered between fetch and parse")
+    parser.add_argument("--extraction", choices=["script", "html"], default="script", help="How cards are read from the browser")
+    parser.add_argument("--output-dir", default="job_data", help="Directory for the JSON-lines shards of new jobs")
+
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as json_file:
+        queries = json.load(json_file)
+
+    # New jobs are appended to job_data/ after every page, merge the shards with indeed_jsonl_sink.py
+    output_sink = JsonlJobSink(args.output_dir)
+    pipeline = IndeedPipeline(IndeedJobScraper(output_sink=output_sink), args.queue_size, args.extraction)
+    saved = pipeline.run(queries, args.pages)
+    pipeline.scraper.close()
+    output_sink.close()
+    print(f"{saved} jobs appended to {args.output_dir}.")
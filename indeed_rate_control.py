@@ -0,0 +1,127 @@
+import random
+import re
+import threading
+import time
+
+from indeed_metrics import METRICS
+
+# Interstitials Indeed (or its CDN) serves instead of results; they carry no job cards.
+# Phrases are matched against the title and visible text only, scripts and inline JSON of
+# an ordinary page may mention captcha or challenge-platform.
+BLOCK_SIGNATURES = re.compile(
+    r"\bcaptcha\b|just a moment\.\.\.|verify you are human|additional verification required|"
+    r"unusual traffic|access denied|request blocked",
+    re.IGNORECASE,
+)
+# Elements only a challenge page renders
+BLOCK_MARKERS = re.compile(
+    r"""id=["'](?:challenge-form|challenge-running|cf-challenge-running)["']|class=["'](?:g-recaptcha|h-captcha)["']""",
+    re.IGNORECASE,
+)
+HIDDEN_BLOCKS = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+TITLE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+TAGS = re.compile(r"<[^>]+>")
+
+def visible_text(html):
+    html = HIDDEN_BLOCKS.sub(" ", html)
+    title = TITLE.search(html)
+    body = TITLE.sub(" ", html)
+    return " ".join(((title.group(1) if title else "") + " " + TAGS.sub(" ", body)).split())
+
+def is_block_page(html):
+    if not html:
+        return False
+    if BLOCK_MARKERS.search(HIDDEN_BLOCKS.sub(" ", html)):
+        return True
+    return BLOCK_SIGNATURES.search(visible_text(html)) is not None
+
+class PageBlockedError(Exception):
+    def __init__(self, url):
+        super().__init__(f"Block or CAPTCHA page for {url}")
+        self.url = url
+
+class HostRate:
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.paused_until = 0.0
+
+class RateController:
+    # Token bucket per Indeed host. The rate grows additively while pages come back fine and
+    # is cut multiplicatively on slow, empty or blocked pages (AIMD); failures also pause the host
+    # for a jittered, exponentially growing backoff.
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=2.0, increase=0.05, decrease=0.5,
+                 latency_target=8.0, base_backoff=5.0, max_backoff=300.0, max_retries=3, empty_retries=1):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        # An empty page is retried this often before it is taken as the end of the results
+        self.empty_retries = empty_retries
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def host(self, locale):
+        # Caller holds the lock
+        key = f"{locale}.indeed.com"
+        if key not in self.hosts:
+            self.hosts[key] = HostRate(self.initial_rate)
+        return self.hosts[key]
+
+    def acquire(self, locale):
+        while True:
+            with self.lock:
+                host = self.host(locale)
+                now = time.monotonic()
+                host.tokens = min(1.0, host.tokens + (now - host.updated) * host.rate)
+                host.updated = now
+                if now < host.paused_until:
+                    delay = host.paused_until - now
+                elif host.tokens >= 1:
+                    host.tokens -= 1
+                    return
+                else:
+                    delay = (1 - host.tokens) / host.rate
+            time.sleep(delay)
+
+    def backoff(self, failures):
+        # Equal jitter: at least half the exponential step, so retries never bunch up at zero
+        step = min(self.max_backoff, self.base_backoff * 2 ** max(0, failures - 1))
+        return step / 2 + random.uniform(0, step / 2)
+
+    def record(self, locale, outcome, latency=None):
+        # outcome is "ok", "empty", "blocked" or "error"; returns the pause before the next page, if any
+        with self.lock:
+            host = self.host(locale)
+            previous = host.rate
+            pause = 0.0
+            if outcome == "ok" and (latency is None or latency <= self.latency_target):
+                host.failures = 0
+                host.rate = min(self.max_rate, host.rate + self.increase)
+            elif outcome == "ok":
+                # Slow but fine, ease off without pausing
+                host.rate = max(self.min_rate, host.rate * self.decrease)
+            else:
+                host.failures += 1
+                host.rate = max(self.min_rate, host.rate * self.decrease)
+                pause = self.backoff(host.failures)
+                host.paused_until = max(host.paused_until, time.monotonic() + pause)
+            rate = host.rate
+
+        METRICS.inc("indeed_page_outcomes_total", locale=locale, outcome=outcome)
+        if rate != previous and outcome != "ok":
+            print(f"Throttling {locale}.indeed.com to {rate:.2f} pages/s after {outcome} page"
+                  + (f", pausing {pause:.0f}s" if pause else ""))
+            METRICS.trace("throttle", locale=locale, outcome=outcome, rate=round(rate, 3), pause_seconds=round(pause, 2))
+        return pause
+
+    def rate(self, locale):
+        with self.lock:
+            return self.host(locale).rate
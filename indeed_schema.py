@@ -0,0 +1,133 @@
+import mysql.connector
+from indeed_db import PreparedStatements
+
+# Bump by appending to MIGRATIONS, never edit a migration that has shipped
+
+COLUMN_EXISTS_SQL = """
+    SELECT COUNT(*) FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'indeed_jobs' AND COLUMN_NAME = %s
+"""
+INDEX_EXISTS_SQL = """
+    SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'indeed_jobs' AND INDEX_NAME = %s
+"""
+
+def column_exists(statements, column):
+    return statements.execute(COLUMN_EXISTS_SQL, (column,)).fetchall()[0][0] > 0
+
+def index_exists(statements, index):
+    return statements.execute(INDEX_EXISTS_SQL, (index,)).fetchall()[0][0] > 0
+
+def migrate_job_key(cursor, statements):
+    if column_exists(statements, "job_key"):
+        return
+
+    # Older tables: backfill the key, drop rows the old check let through, then enforce it
+    cursor.execute("ALTER TABLE indeed_jobs ADD COLUMN job_key CHAR(40) NULL AFTER id")
+    cursor.execute("UPDATE indeed_jobs SET job_key = SHA1(CONCAT_WS('|', title, company, date_of_post))")
+    cursor.execute("""
+        DELETE newer FROM indeed_jobs newer
+        JOIN indeed_jobs older ON newer.job_key = older.job_key AND newer.id > older.id
+    """)
+    cursor.execute("ALTER TABLE indeed_jobs ADD UNIQUE KEY uq_job_key (job_key)")
+
+def migrate_column_types(cursor, statements):
+    # Anything that is not an ISO date cannot become a DATE
+    cursor.execute("""
+        UPDATE indeed_jobs SET date_of_post = NULL
+        WHERE date_of_post IS NOT NULL AND date_of_post NOT REGEXP '^[0-9]{4}-[0-9]{2}-[0-9]{2}$'
+    """)
+    cursor.execute("""
+        UPDATE indeed_jobs SET
+            title = LEFT(title, 255),
+            title_search = LEFT(title_search, 150),
+            company = LEFT(company, 255),
+            job_link = LEFT(job_link, 2048),
+            job_type = LEFT(job_type, 32),
+            location = LEFT(location, 255),
+            location_search = LEFT(location_search, 150),
+            search_query = LEFT(search_query, 1024)
+    """)
+    cursor.execute("""
+        ALTER TABLE indeed_jobs
+            MODIFY title VARCHAR(255),
+            MODIFY title_search VARCHAR(150),
+            MODIFY company VARCHAR(255),
+            MODIFY job_link VARCHAR(2048),
+            MODIFY job_type VARCHAR(32),
+            MODIFY location VARCHAR(255),
+            MODIFY location_search VARCHAR(150),
+            MODIFY search_query VARCHAR(1024),
+            MODIFY date_of_post DATE
+    """)
+
+def migrate_search_indexes(cursor, statements):
+    if not column_exists(statements, "jk"):
+        cursor.execute("ALTER TABLE indeed_jobs ADD COLUMN jk VARCHAR(32) NULL AFTER job_key")
+
+    # Indeed's own job id, taken from the jk= parameter of the job link
+    cursor.execute("""
+        UPDATE indeed_jobs
+        SET jk = SUBSTRING_INDEX(SUBSTRING_INDEX(job_link, 'jk=', -1), '&', 1)
+        WHERE jk IS NULL AND job_link LIKE '%jk=%'
+    """)
+    cursor.execute("""
+        DELETE newer FROM indeed_jobs newer
+        JOIN indeed_jobs older ON newer.jk = older.jk AND newer.id > older.id
+    """)
+
+    indexes = [
+        ("uq_jk", "ADD UNIQUE KEY uq_jk (jk)"),
+        ("idx_location_title_date", "ADD INDEX idx_location_title_date (location_search, title_search, date_of_post)"),
+        ("idx_title_date", "ADD INDEX idx_title_date (title_search, date_of_post)"),
+        ("idx_date_of_post", "ADD INDEX idx_date_of_post (date_of_post)"),
+        ("ft_title_search", "ADD FULLTEXT INDEX ft_title_search (title_search)"),
+        ("ft_location_search", "ADD FULLTEXT INDEX ft_location_search (location_search)"),
+    ]
+    for name, clause in indexes:
+        if not index_exists(statements, name):
+            cursor.execute(f"ALTER TABLE indeed_jobs {clause}")
+
+MIGRATIONS = [
+    (1, "unique job_key", migrate_job_key),
+    (2, "bounded VARCHAR and DATE columns", migrate_column_types),
+    (3, "jk column, unique and search indexes", migrate_search_indexes),
+]
+
+def current_version(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS indeed_schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255),
+            applied_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM indeed_schema_version")
+    return cursor.fetchone()[0]
+
+def migrate_schema(conn):
+    cursor = conn.cursor()
+    statements = PreparedStatements(conn)
+    try:
+        version = current_version(cursor)
+
+        for migration_version, description, migration in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            print(f"Migrating 'indeed_jobs' to version {migration_version}: {description}")
+            # MySQL DDL commits implicitly, every step is written to be safe to re-run
+            migration(cursor, statements)
+            cursor.execute(
+                "INSERT INTO indeed_schema_version (version, description) VALUES (%s, %s)",
+                (migration_version, description)
+            )
+            conn.commit()
+
+        return max(version, MIGRATIONS[-1][0])
+    except mysql.connector.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+        return None
+    finally:
+        statements.close()
+        cursor.close()
@@ -0,0 +1,292 @@
+import os
+import sqlite3
+
+import mysql.connector
+from dotenv import load_dotenv
+import indeed_db
+from indeed_metrics import METRICS
+from indeed_schema import MIGRATIONS, migrate_schema
+load_dotenv()
+
+# Every backend takes the same row tuples, in this column order
+JOB_COLUMNS = ["job_key", "jk", "title", "company", "job_link", "location", "date_of_post",
+               "title_search", "location_search", "search_query", "job_type"]
+
+# Duplicates are rejected by the unique job_key and jk indexes, "id = id" turns them into no-ops
+# so the affected row count only includes real inserts
+INSERT_JOB_SQL = f"""
+    INSERT INTO indeed_jobs ({', '.join(JOB_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(JOB_COLUMNS))})
+    ON DUPLICATE KEY UPDATE id = id
+"""
+
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS indeed_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_key TEXT,
+        jk TEXT,
+        title TEXT,
+        title_search TEXT COLLATE NOCASE,
+        company TEXT,
+        job_link TEXT,
+        job_type TEXT,
+        location TEXT,
+        location_search TEXT COLLATE NOCASE,
+        search_query TEXT,
+        date_of_post TEXT,
+        created_on TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_job_key ON indeed_jobs (job_key)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_jk ON indeed_jobs (jk)",
+    "CREATE INDEX IF NOT EXISTS idx_location_title_date ON indeed_jobs (location_search, title_search, date_of_post)",
+    "CREATE INDEX IF NOT EXISTS idx_title_date ON indeed_jobs (title_search, date_of_post)",
+    "CREATE INDEX IF NOT EXISTS idx_date_of_post ON indeed_jobs (date_of_post)",
+    # Trigram tokens let MATCH answer the substring searches view_data does
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS indeed_jobs_fts USING fts5(
+        title_search, location_search, content='indeed_jobs', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indeed_jobs_fts_insert AFTER INSERT ON indeed_jobs BEGIN
+        INSERT INTO indeed_jobs_fts (rowid, title_search, location_search)
+        VALUES (new.id, new.title_search, new.location_search);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indeed_jobs_fts_delete AFTER DELETE ON indeed_jobs BEGIN
+        INSERT INTO indeed_jobs_fts (indeed_jobs_fts, rowid, title_search, location_search)
+        VALUES ('delete', old.id, old.title_search, old.location_search);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indeed_jobs_fts_update AFTER UPDATE ON indeed_jobs BEGIN
+        INSERT INTO indeed_jobs_fts (indeed_jobs_fts, rowid, title_search, location_search)
+        VALUES ('delete', old.id, old.title_search, old.location_search);
+        INSERT INTO indeed_jobs_fts (rowid, title_search, location_search)
+        VALUES (new.id, new.title_search, new.location_search);
+    END
+    """,
+]
+
+class MySQLStorage:
+    name = "mysql"
+    Error = mysql.connector.Error
+
+    def __init__(self):
+        self.conn = None
+        self.statements = None
+
+    def connect(self):
+        # Pooled, close() hands the connection back instead of disconnecting
+        self.conn = indeed_db.get_connection()
+
+    def close(self):
+        if self.statements is not None:
+            self.statements.close()
+            self.statements = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def create_jobs_table(self):
+        with indeed_db.cursor(self.conn, commit=True) as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS indeed_jobs (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    job_key CHAR(40) NULL,
+                    title TEXT,
+                    title_search TEXT,
+                    company TEXT,
+                    job_link TEXT,
+                    job_type TEXT,
+                    location TEXT,
+                    location_search TEXT,
+                    search_query TEXT,
+                    date_of_post TEXT,
+                    created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE KEY uq_job_key (job_key)
+                )
+            """)
+        migrate_schema(self.conn)
+
+    def migrate(self):
+        return migrate_schema(self.conn)
+
+    def search_condition(self, column, value, search_mode="contains"):
+        if search_mode == "prefix":
+            # Anchored LIKE can use the (location_search, title_search, date_of_post) index
+            return f"{column} LIKE %s", f"{value}%"
+        if search_mode == "fulltext":
+            terms = " ".join(f"+{word}*" for word in value.split())
+            return f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)", terms
+        return f"{column} LIKE %s", f"%{value}%"
+
+    def insert_jobs(self, rows):
+        # One transaction per batch, rolled back as a whole on error
+        try:
+            with indeed_db.cursor(self.conn) as cursor:
+                with METRICS.timer("indeed_db_query_seconds", backend=self.name, statement="insert"):
+                    cursor.executemany(INSERT_JOB_SQL, rows)
+                inserted = max(cursor.rowcount, 0)
+            with METRICS.timer("indeed_db_commit_seconds", backend=self.name):
+                self.conn.commit()
+        except mysql.connector.Error:
+            self.conn.rollback()
+            raise
+        return inserted
+
+    def end_read(self):
+        # Autocommit is off, a SELECT opens a REPEATABLE READ snapshot that lasts until the
+        # transaction ends. Ending it lets the next read on this connection see new rows and
+        # releases the metadata locks migrations wait for.
+        self.conn.rollback()
+
+    def fetch_all(self, sql, params=()):
+        try:
+            with indeed_db.cursor(self.conn) as cursor:
+                with METRICS.timer("indeed_db_query_seconds", backend=self.name, statement="select"):
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+        finally:
+            self.end_read()
+
+    def fetch_prepared(self, sql, params=()):
+        # Prepared once per connection, repeated page queries only send their parameters
+        if self.statements is None:
+            self.statements = indeed_db.PreparedStatements(self.conn)
+        try:
+            with METRICS.timer("indeed_db_query_seconds", backend=self.name, statement="select"):
+                return self.statements.execute(sql, params).fetchall()
+        finally:
+            self.end_read()
+
+    def execute(self, sql, params=()):
+        with indeed_db.cursor(self.conn, commit=True) as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def stream(self, sql, params=(), chunk_size=1000):
+        # Unbuffered cursor, rows stream from the server one chunk at a time
+        cursor = self.conn.cursor(buffered=False)
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if self.conn.unread_result:
+                self.conn.consume_results()
+            cursor.close()
+            self.end_read()
+
+    def clear(self):
+        with indeed_db.cursor(self.conn, commit=True) as cursor:
+            cursor.execute("TRUNCATE TABLE indeed_jobs")
+            cursor.execute("ALTER TABLE indeed_jobs AUTO_INCREMENT = 1")  # Reset auto-increment primary key
+
+class SQLiteStorage:
+    # Embedded single-file store for local and offline runs, no server needed
+    name = "sqlite"
+    Error = sqlite3.Error
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SQLITE_PATH", "indeed_jobs.db")
+        self.conn = None
+
+    def connect(self):
+        # Scrapers hand their writer to other threads (pipeline, GUI), one thread uses it at a time
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints and stays crash-safe
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def sql(self, sql):
+        # Queries are written with MySQL's %s placeholders
+        return sql.replace("%s", "?")
+
+    def create_jobs_table(self):
+        with self.conn:
+            for statement in SQLITE_SCHEMA:
+                self.conn.execute(statement)
+            # Created at the current schema, there is nothing to step through
+            self.conn.execute(f"PRAGMA user_version = {MIGRATIONS[-1][0]}")
+
+    def migrate(self):
+        self.create_jobs_table()
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def search_condition(self, column, value, search_mode="contains"):
+        if search_mode == "prefix":
+            # NOCASE columns let an anchored LIKE use the indexes
+            return f"{column} LIKE %s", f"{value}%"
+        words = value.split() if search_mode == "fulltext" else [value]
+        if min(len(word) for word in words) < 3:
+            # Trigrams cannot match anything shorter than three characters
+            return f"{column} LIKE %s", f"%{value}%"
+        phrases = " AND ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+        return f"id IN (SELECT rowid FROM indeed_jobs_fts WHERE indeed_jobs_fts MATCH %s)", f"{column}: ({phrases})"
+
+    def insert_jobs(self, rows):
+        # One transaction per batch, a single fsync instead of one per row
+        try:
+            with METRICS.timer("indeed_db_query_seconds", backend=self.name, statement="insert"):
+                cursor = self.conn.executemany(f"""
+                    INSERT OR IGNORE INTO indeed_jobs ({', '.join(JOB_COLUMNS)})
+                    VALUES ({', '.join(['?'] * len(JOB_COLUMNS))})
+                """, rows)
+            with METRICS.timer("indeed_db_commit_seconds", backend=self.name):
+                self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        return max(cursor.rowcount, 0)
+
+    def fetch_all(self, sql, params=()):
+        with METRICS.timer("indeed_db_query_seconds", backend=self.name, statement="select"):
+            return self.conn.execute(self.sql(sql), params).fetchall()
+
+    def fetch_prepared(self, sql, params=()):
+        # sqlite3 already reuses compiled statements from its per-connection cache
+        return self.fetch_all(sql, params)
+
+    def execute(self, sql, params=()):
+        with self.conn:
+            return self.conn.execute(self.sql(sql), params).rowcount
+
+    def stream(self, sql, params=(), chunk_size=1000):
+        cursor = self.conn.execute(self.sql(sql), params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM indeed_jobs")
+            self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'indeed_jobs'")  # Reset auto-increment primary key
+
+STORAGE_BACKENDS = {
+    "mysql": MySQLStorage,
+    "sqlite": SQLiteStorage,
+}
+
+def get_storage(backend=None):
+    # DB_BACKEND=sqlite keeps everything in SQLITE_PATH (indeed_jobs.db by default)
+    backend = backend or os.getenv("DB_BACKEND", "mysql")
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}', use one of {', '.join(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[backend]()
@@ -0,0 +1,57 @@
+import json
+import os
+from datetime import datetime
+
+from indeed_checkpoints import file_lock
+
+class CrawlWatermarkStore:
+    # Newest posting date and the job keys at the top of the last complete crawl, per query
+    def __init__(self, path="crawl_watermarks.json"):
+        self.path = path
+        # Shared by every store on this file, updates re-read it so other scrapers' marks survive
+        self.lock = file_lock(path)
+        self.watermarks = self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    @staticmethod
+    def query_key(designation, location, locale, job_type, switched_by):
+        return "|".join(str(part or "").strip().lower() for part in (designation, location, locale, job_type, switched_by))
+
+    def get(self, key):
+        return self.watermarks.get(key)
+
+    def update(self, key, date, job_keys):
+        watermark = {
+            "date": date,
+            "job_keys": list(job_keys),
+            "updated_on": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.lock:
+            self.watermarks = self.load()
+            self.watermarks[key] = watermark
+            self.save()
+
+    def save(self):
+        # Caller holds the lock. Temp file plus rename, a crash never leaves a half-written store
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as json_file:
+            json.dump(self.watermarks, json_file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+def crossed_watermark(watermark, page_keys, page_dates, known_count):
+    if not watermark:
+        return False
+    # Reached the top of the previous crawl, everything after it is stored already. Sponsored
+    # postings repeat across crawls, so a few known keys are not enough, most of the page must be.
+    top_keys = set(watermark["job_keys"])
+    if page_keys and sum(key in top_keys for key in page_keys) * 2 > len(page_keys):
+        return True
+    # Known jobs mixed with postings older than the previous high-water date
+    if not watermark.get("date") or not page_dates:
+        return False
+    return known_count > 0 and min(page_dates) < watermark["date"]
@@ -0,0 +1,164 @@
+import argparse
+import json
+import queue
+import threading
+import time
+import traceback
+from collections import defaultdict
+
+from indeed_job_scraper import IndeedJobScraper
+from indeed_fetchers import HttpFetcher
+from indeed_rate_control import RateController
+
+class HostLimiter:
+    def __init__(self, per_host_concurrency=2, min_interval=2.0):
+        self.per_host_concurrency = per_host_concurrency
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.semaphores = defaultdict(lambda: threading.Semaphore(self.per_host_concurrency))
+        self.next_allowed = defaultdict(float)
+
+    def acquire(self, host):
+        with self.lock:
+            semaphore = self.semaphores[host]
+        semaphore.acquire()
+
+        # Space out request starts on the same host
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.next_allowed[host]:
+                    self.next_allowed[host] = now + self.min_interval
+                    return
+                delay = self.next_allowed[host] - now
+            time.sleep(delay)
+
+    def release(self, host):
+        with self.lock:
+            semaphore = self.semaphores[host]
+        semaphore.release()
+
+class IndeedScraperPool:
+    def __init__(self, workers=3, per_host_concurrency=2, min_interval=2.0, extraction="script",
+                 scraper_factory=IndeedJobScraper, fetch_backends=None):
+        self.workers = workers
+        # Locales on the HTTP backend share one keep-alive connection pool across workers
+        self.fetch_backends = fetch_backends
+        self.http_fetcher = HttpFetcher(max_connections=workers)
+        self.extraction = extraction
+        self.scraper_factory = scraper_factory
+        self.limiter = HostLimiter(per_host_concurrency, min_interval)
+        # One AIMD controller for all workers, a block seen by one slows down every worker on that host
+        self.rate_controller = RateController()
+        self.stop_event = threading.Event()
+        self.scrapers = []
+        self.scrapers_lock = threading.Lock()
+
+    def scrape(self, queries, num_pages=2):
+        # queries: list of dicts with title, location, locale, job_type and switched_by
+        self.stop_event.clear()
+        tasks = queue.Queue()
+        results = queue.Queue()
+        exhausted = {}
+        exhausted_lock = threading.Lock()
+
+        # Breadth first so a query that runs out of results prunes its later pages early
+        for page in range(num_pages):
+            for index in range(len(queries)):
+                tasks.put((index, page))
+
+        def worker():
+            scraper = None
+            try:
+                while not self.stop_event.is_set():
+                    try:
+                        index, page = tasks.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    with exhausted_lock:
+                        if page > exhausted.get(index, num_pages):
+                            continue
+
+                    if scraper is None:
+                        scraper = self.scraper_factory(fetch_backends=self.fetch_backends, http_fetcher=self.http_fetcher)
+                        scraper.extraction = self.extraction
+                        scraper.rate_controller = self.rate_controller
+                        with self.scrapers_lock:
+                            self.scrapers.append(scraper)
+
+                    query = queries[index]
+                    locale = query.get("locale", "de")
+                    host = f"{locale}.indeed.com"
+                    job_type = scraper.select_job_type(query.get("job_type", "Fulltime"))
+
+                    self.limiter.acquire(host)
+                    try:
+                        new_jobs, card_count = scraper.scrape_page(
+                            query["title"], query.get("location", ""), page, job_type, locale,
+                            query.get("switched_by", "All")
+                        )
+                    except Exception as e:
+                        print(f"Error: {e}")
+                        traceback.print_exc()
+                        continue
+                    finally:
+                        self.limiter.release(host)
+
+                    if card_count < 15:
+                        with exhausted_lock:
+                            exhausted[index] = min(page, exhausted.get(index, num_pages))
+
+                    for job_data in new_jobs:
+                        results.put(job_data)
+            finally:
+                results.put(None)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        # Merge every worker's output into one stream, dropping cross-worker duplicates
+        seen_links = set()
+        finished = 0
+        try:
+            while finished < len(threads):
+                job_data = results.get()
+                if job_data is None:
+                    finished += 1
+                    continue
+                if job_data.job_link in seen_links:
+                    continue
+                seen_links.add(job_data.job_link)
+                yield job_data
+        finally:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+            self.close()
+
+    def close(self):
+        with self.scrapers_lock:
+            scrapers, self.scrapers = self.scrapers, []
+        for scraper in scrapers:
+            scraper.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape several Indeed queries in parallel")
+    parser.add_argument("queries", help="JSON file with a list of {title, location, locale, job_type, switched_by}")
+    parser.add_argument("--pages", type=int, default=2, help="Number of pages to scrape per query")
+    parser.add_argument("--workers", type=int, default=3, help="Number of browser instances")
+    parser.add_argument("--per-host", type=int, default=2, help="Maximum concurrent pages per Indeed host")
+    parser.add_argument("--min-interval", type=float, default=2.0, help="Minimum seconds between requests to one host")
+
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as json_file:
+        queries = json.load(json_file)
+
+    pool = IndeedScraperPool(args.workers, args.per_host, args.min_interval)
+    job_data_list = [job_data.to_dict() for job_data in pool.scrape(queries, args.pages)]
+
+    with open("job_data.json", "w", encoding="utf-8") as json_file:
+        json.dump(job_data_list, json_file, ensure_ascii=False, indent=2)
+    print(f"Data saved to job_data.json ({len(job_data_list)} jobs).")